@@ -0,0 +1,68 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Compare le tirage pondéré avec une table d'alias (texte.AliasTable) et
+avec random.choices, pour des listes de tailles croissantes'''
+
+import argparse
+import itertools
+from pathlib import Path
+import random
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from texte import AliasTable  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=10000,
+                        help='nombre de tirages par mesure')
+    args = parser.parse_args()
+
+    print(f"{'éléments':>9} {'construction (ms)':>18} {'alias (µs)':>11} "
+          f"{'choices (µs)':>13} {'choices cumulé (µs)':>20}")
+    for taille in (10, 1000, 100000):
+        rng = random.Random(0)
+        elements = list(range(taille))
+        # Fréquences à la Zipf, comme pour les mots d'une langue
+        poids = [1 / (rang + 1) for rang in range(taille)]
+        rng.shuffle(poids)
+        cumul = list(itertools.accumulate(poids))
+
+        construction = timeit.timeit(lambda: AliasTable(elements, poids),
+                                     number=3) / 3
+        table = AliasTable(elements, poids)
+        durees = [
+            timeit.timeit(fonction, number=args.n) / args.n
+            for fonction in (
+                table.choice,
+                lambda: random.choices(elements, poids)[0],
+                lambda: random.choices(elements, cum_weights=cumul)[0])]
+        print(f'{taille:>9} {construction * 1e3:>18.2f} '
+              f'{durees[0] * 1e6:>11.2f} {durees[1] * 1e6:>13.2f} '
+              f'{durees[2] * 1e6:>20.2f}')
+
+
+if __name__ == '__main__':
+    main()
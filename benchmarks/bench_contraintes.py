@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Compare le coût de genere_phrase avec et sans contraintes, quand le
+nombre de structures et de verbes augmente'''
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import texte  # noqa: E402
+
+
+CONTRAINTES = {'verbe': 'manger', 'adv': 'bien'}
+
+
+def agrandit(facteur):
+    'Multiplie le nombre de structures et de verbes par facteur'
+    texte.structures_phrase[:] = texte.structures_phrase[:12] * facteur
+    texte.poids_structures[:] = texte.poids_structures[:12] * facteur
+    for i in range(len(texte.verbes), 17 * facteur):
+        cara = {'groupe': 1, 'radical': f'chant{i}', 'transitif': bool(i % 2),
+                'pronominal': False}
+        texte.verbes[f'chant{i}er'] = cara
+        texte.tables_conjugaison[f'chant{i}er'] = texte._table_verbe_dict(cara)
+    texte.indexe_structures()
+    texte.indexe_lexique()
+
+
+def vitesse(n, **contraintes):
+    random.seed(0)
+    debut = time.perf_counter()
+    for _ in range(n):
+        texte.genere_phrase(**contraintes)
+    return n / (time.perf_counter() - debut)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=10000,
+                        help='nombre de phrases par mesure')
+    args = parser.parse_args()
+
+    print(f"{'structures':>10} {'verbes':>8} {'sans contrainte':>16} "
+          f"{'avec contraintes':>17}  (phrases/s)")
+    for facteur in (1, 10, 100, 1000):
+        agrandit(facteur)
+        print(f'{len(texte.structures_phrase):>10} {len(texte.verbes):>8} '
+              f'{vitesse(args.n):>16.0f} '
+              f'{vitesse(args.n, **CONTRAINTES):>17.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Compare un corpus gardé en listes de listes de chaînes (le contenu
+renvoyé par genere_phrase) et un corpus.Corpus : mémoire, filtrage par mot,
+découpage et enregistrement. Chaque opération du Corpus est d'abord
+vérifiée contre le même calcul sur les listes.'''
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import corpus as module_corpus  # noqa: E402
+from corpus import Corpus  # noqa: E402
+from texte import finalise_phrase, genere_phrases  # noqa: E402
+
+
+def chrono(fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    return resultat, time.perf_counter() - debut
+
+
+def verifie(corpus, listes, mot, chemin):
+    'Vérifie le Corpus contre les listes, avec et sans numpy'
+    assert len(corpus) == len(listes)
+    assert corpus[0] == finalise_phrase(listes[0])
+    assert corpus[-1] == finalise_phrase(listes[-1])
+    assert [corpus.mots(i) for i in range(len(corpus))] == listes
+    tranche = corpus[len(listes) // 3:len(listes) // 2]
+    assert [tranche.mots(i) for i in range(len(tranche))] == \
+        listes[len(listes) // 3:len(listes) // 2]
+    pas = corpus[::7]
+    assert [pas.mots(i) for i in range(len(pas))] == listes[::7]
+    np = module_corpus.np
+    for numpy in ({np, None} if np is not None else {None}):
+        module_corpus.np = numpy
+        try:
+            for present in (True, False):
+                filtre = corpus.filtre(mot, present)
+                assert [filtre.mots(i) for i in range(len(filtre))] == \
+                    [p for p in listes if (mot in p) == present]
+            assert len(corpus.filtre('absent du corpus')) == 0
+        finally:
+            module_corpus.np = np
+    corpus.sauve(chemin)
+    relu = Corpus.charge(chemin)
+    assert relu.vocabulaire.mots == corpus.vocabulaire.mots
+    assert relu.jetons == corpus.jetons and relu.debuts == corpus.debuts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=200000,
+                        help='nombre de phrases')
+    args = parser.parse_args()
+
+    phrases = list(genere_phrases(args.n, seed=0, finalise=False))
+
+    # Mémoire de la copie des listes (les chaînes des mots sont partagées
+    # avec le lexique, comme dans genere_phrase)
+    tracemalloc.start()
+    listes = [list(p) for p in phrases]
+    memoire_listes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    corpus = Corpus()
+    _, construction = chrono(lambda: corpus.etend(phrases))
+
+    with tempfile.TemporaryDirectory() as dossier:
+        verifie(corpus, listes, 'jamais', Path(dossier) / 'verification.bin')
+
+    print(f'{args.n} phrases, {len(corpus.jetons)} jetons, '
+          f'{len(corpus.vocabulaire)} mots, construction {construction:.2f} s')
+    print(f"{'':<24} {'listes':>12} {'Corpus':>12}")
+    print(f"{'mémoire (Mio)':<24} {memoire_listes / 2**20:>12.1f} "
+          f'{corpus.nbytes() / 2**20:>12.1f}')
+
+    mot = 'jamais'
+    _, duree_listes = chrono(lambda: [p for p in listes if mot in p])
+    _, duree_corpus = chrono(lambda: corpus.filtre(mot))
+    print(f"{f'filtre {mot!r} (ms)':<24} {duree_listes * 1e3:>12.1f} "
+          f'{duree_corpus * 1e3:>12.1f}')
+
+    milieu = args.n // 2
+    _, duree_listes = chrono(lambda: listes[milieu:milieu + args.n // 4])
+    _, duree_corpus = chrono(lambda: corpus[milieu:milieu + args.n // 4])
+    print(f"{'tranche de n/4 (ms)':<24} {duree_listes * 1e3:>12.1f} "
+          f'{duree_corpus * 1e3:>12.1f}')
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = Path(dossier) / 'corpus.bin'
+        _, sauve = chrono(lambda: corpus.sauve(chemin))
+        _, charge = chrono(lambda: Corpus.charge(chemin))
+        print(f'fichier : {chemin.stat().st_size / 2**20:.1f} Mio, '
+              f'enregistré en {sauve * 1e3:.0f} ms, '
+              f'lu en {charge * 1e3:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
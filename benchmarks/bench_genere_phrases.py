@@ -0,0 +1,72 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+'Compare genere_phrases à une boucle sur genere_phrase'
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from texte import finalise_phrase, genere_phrase, genere_phrases  # noqa: E402
+
+
+def boucle(n, **contraintes):
+    for _ in range(n):
+        finalise_phrase(genere_phrase(**contraintes)['contenu'])
+
+
+def lot(n, **contraintes):
+    for _ in genere_phrases(n, **contraintes):
+        pass
+
+
+def mesure(fonction, n, **contraintes):
+    random.seed(0)
+    debut = time.perf_counter()
+    fonction(n, **contraintes)
+    return n / (time.perf_counter() - debut)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=20000,
+                        help='nombre de phrases par mesure')
+    args = parser.parse_args()
+
+    cas = {
+        'sans contrainte': {},
+        "verbe='manger'": {'verbe': 'manger'},
+        "adv='bien', temps='present'": {'adv': 'bien', 'temps': 'present'},
+    }
+    print(f"{'contraintes':<30} {'boucle (phrases/s)':>20} "
+          f"{'lot (phrases/s)':>20} {'gain':>8}")
+    for nom, contraintes in cas.items():
+        vitesse_boucle = mesure(boucle, args.n, **contraintes)
+        vitesse_lot = mesure(lot, args.n, **contraintes)
+        print(f'{nom:<30} {vitesse_boucle:>20.0f} {vitesse_lot:>20.0f} '
+              f'{vitesse_lot / vitesse_boucle:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Temps d'import de texte avec un lexique source (TEXTE_LEXIQUE) de plus en
+plus grand, sans et avec instantané (TEXTE_INSTANTANE). Chaque mesure est
+faite dans un nouveau processus.'''
+
+import argparse
+import json
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+
+import lexique  # noqa: E402
+
+# Affiche la durée de l'import en secondes
+IMPORT = '''
+import time
+debut = time.perf_counter()
+import texte
+print(time.perf_counter() - debut)
+'''
+
+
+def source_agrandie(nombre):
+    '''Lexique intégré au format JSON, avec nombre verbes, noms et
+    adjectifs de plus'''
+    source = lexique.exporte_lexique_integre()
+    for i in range(nombre):
+        source['verbes'][f'chant{i}er'] = {
+            'groupe': 1, 'radical': f'chant{i}', 'transitif': bool(i % 2),
+            'pronominal': False}
+        source['noms']['masculin'].append(f'chanteur{i}')
+        source['adjectifs']['feminin'].append(f'chanteuse{i}')
+    return source
+
+
+def duree_import(repetitions, source=None, instantane=None):
+    env = dict(os.environ)
+    env.pop('TEXTE_LEXIQUE', None)
+    env.pop('TEXTE_INSTANTANE', None)
+    if source is not None:
+        env['TEXTE_LEXIQUE'] = source
+    if instantane is not None:
+        env['TEXTE_INSTANTANE'] = instantane
+    durees = [
+        float(subprocess.run(
+            [sys.executable, '-c', IMPORT], cwd=RACINE,
+            env=env, check=True, capture_output=True, text=True).stdout)
+        for _ in range(repetitions)]
+    return statistics.median(durees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-r', '--repetitions', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'lexique intégré : {duree_import(args.repetitions) * 1e3:.1f} ms')
+    print(f"{'mots ajoutés':>12} {'à froid (ms)':>13} "
+          f"{'instantané (ms)':>16}")
+    with tempfile.TemporaryDirectory() as dossier:
+        for nombre in (0, 1000, 10000):
+            source = os.path.join(dossier, f'lexique-{nombre}.json')
+            with open(source, 'w', encoding='utf-8') as f:
+                json.dump(source_agrandie(nombre), f, ensure_ascii=False)
+            instantane = os.path.join(dossier, f'moteur-{nombre}.pickle')
+            froid = duree_import(args.repetitions, source)
+            # Le premier import écrit l'instantané
+            duree_import(1, source, instantane)
+            chaud = duree_import(args.repetitions, source, instantane)
+            print(f'{nombre:>12} {froid * 1e3:>13.1f} {chaud * 1e3:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Mesure le temps d'ouverture d'un lexique compilé, la mémoire utilisée et
+la vitesse de génération en fonction de la taille du lexique'''
+
+import argparse
+from pathlib import Path
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lexique  # noqa: E402
+import texte  # noqa: E402
+
+
+def lexique_synthetique(taille):
+    'Lexique de taille noms, adjectifs et verbes par genre, inventés'
+    source = lexique.exporte_lexique_integre()
+    for categorie in ('noms', 'adjectifs'):
+        for genre, mots in source[categorie].items():
+            mots.extend([f'{mots[i % len(mots)]}{i}' for i in range(taille)])
+    for i in range(taille):
+        source['verbes'][f'chanter{i}'] = {
+            'groupe': 1, 'radical': f'chant{i}', 'transitif': bool(i % 2),
+            'pronominal': False}
+    return source
+
+
+def rss():
+    'Mémoire résidente du processus courant, en Kio (Linux seulement)'
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def mesure(chemin, n):
+    'Mesure dans le processus courant : appelé dans un sous-processus'
+    rss_avant = rss()
+    debut = time.perf_counter()
+    texte.utilise_lexique(lexique.Lexique(chemin))
+    ouverture = time.perf_counter() - debut
+    debut = time.perf_counter()
+    for _ in texte.genere_phrases(n, seed=0):
+        pass
+    vitesse = n / (time.perf_counter() - debut)
+    print(f'{ouverture * 1000:.2f} {rss() - rss_avant} {vitesse:.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=5000,
+                        help='nombre de phrases générées par lexique')
+    parser.add_argument('--mesure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mesure:
+        mesure(args.mesure, args.n)
+        return
+
+    print(f"{'mots':>8} {'fichier (Kio)':>14} {'ouverture (ms)':>15} "
+          f"{'mémoire (Kio)':>14} {'phrases/s':>10}")
+    with tempfile.TemporaryDirectory() as dossier:
+        for taille in (1000, 10000, 100000, 200000):
+            chemin = Path(dossier) / f'lexique-{taille}.bin'
+            lexique.compile_lexique(lexique_synthetique(taille), chemin)
+            # Chaque lexique est mesuré dans un processus neuf
+            sortie = subprocess.run(
+                [sys.executable, __file__, '-n', str(args.n),
+                 '--mesure', str(chemin)],
+                check=True, capture_output=True, text=True).stdout
+            ouverture, rss, vitesse = sortie.split()
+            print(f'{taille:>8} {chemin.stat().st_size // 1024:>14} '
+                  f'{ouverture:>15} {rss:>14} {vitesse:>10}')
+
+
+if __name__ == '__main__':
+    main()
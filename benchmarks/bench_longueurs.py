@@ -0,0 +1,81 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Compare la génération de phrases d'une longueur donnée avec le module
+longueurs et en rejetant les phrases de genere_phrase trop courtes ou trop
+longues'''
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import longueurs  # noqa: E402
+from texte import finalise_phrase, genere_phrase, genere_phrases  # noqa: E402
+
+
+def par_rejet(n, minimum, maximum, unite):
+    'Renvoie les phrases et le nombre de phrases générées pour les obtenir'
+    phrases = []
+    essais = 0
+    while len(phrases) < n:
+        essais += 1
+        contenu = genere_phrase()['contenu']
+        if minimum <= longueurs.mesure(contenu, unite) <= maximum:
+            phrases.append(finalise_phrase(contenu))
+    return phrases, essais
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=1000,
+                        help='nombre de phrases par intervalle')
+    args = parser.parse_args()
+
+    print(f"{'intervalle':>16} {'rejet (ms)':>11} {'essais':>9} "
+          f"{'plan (ms)':>10} {'longueurs (ms)':>15} {'gain':>6}")
+    for minimum, maximum, unite in ((35, 45, 'caracteres'),
+                                    (20, 20, 'caracteres'),
+                                    (90, 100, 'caracteres'),
+                                    (5, 5, 'mots'), (14, 16, 'mots')):
+        random.seed(0)
+        debut = time.perf_counter()
+        _, essais = par_rejet(args.n, minimum, maximum, unite)
+        rejet = time.perf_counter() - debut
+
+        # Le premier appel calcule les mesures et les cadres de phrase
+        debut = time.perf_counter()
+        longueurs.plan(minimum, maximum, unite)
+        plan = time.perf_counter() - debut
+        debut = time.perf_counter()
+        list(genere_phrases(args.n, min_len=minimum, max_len=maximum,
+                            unite=unite))
+        duree = time.perf_counter() - debut
+        print(f'{f"{minimum}-{maximum} {unite}":>16} {rejet * 1e3:>11.0f} '
+              f'{essais:>9} {plan * 1e3:>10.0f} {duree * 1e3:>15.0f} '
+              f'{rejet / duree:>5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Compare les deux façons de régénérer les phrases de la page web :
+réexécuter tout texte.py (ancienne page, pyodide.runPython) ou appeler
+texte.genere_lot() sur le module importé une fois'''
+
+import argparse
+import contextlib
+import io
+from pathlib import Path
+import sys
+import time
+import types
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import texte  # noqa: E402
+
+
+def reexecute(code):
+    'Exécute texte.py comme runPython : en tant que __main__'
+    module = types.ModuleType('__main__')
+    principal = sys.modules['__main__']
+    sys.modules['__main__'] = module
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            exec(code, module.__dict__)
+    finally:
+        sys.modules['__main__'] = principal
+    return module.phrases
+
+
+def duree(fonction, repetitions):
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        fonction()
+    return (time.perf_counter() - debut) / repetitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-r', '--repetitions', type=int, default=20,
+                        help='nombre de clics simulés')
+    args = parser.parse_args()
+
+    code = compile(Path(texte.__file__).read_text(encoding='utf-8'),
+                   texte.__file__, 'exec')
+    ancien = duree(lambda: reexecute(code), args.repetitions)
+    nouveau = duree(lambda: texte.genere_lot(100), args.repetitions)
+    print(f"{'réexécution de texte.py':<26}{ancien * 1e3:>10.2f} ms/clic")
+    print(f"{'genere_lot(100)':<26}{nouveau * 1e3:>10.2f} ms/clic")
+    print(f"{'gain':<26}{ancien / nouveau:>10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
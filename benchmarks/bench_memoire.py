@@ -0,0 +1,96 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Mesure avec tracemalloc la mémoire occupée par des arbres de phrases, et
+par les mêmes arbres faits de dataclasses ordinaires (sans __slots__, avec
+des listes et une instance par mot) pour comparaison'''
+
+import argparse
+import dataclasses
+import functools
+from pathlib import Path
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from texte import (Chunk, DirectObject, NounGroup, Person,  # noqa: E402
+                   Pronoun, Sentence, Subject, Tense, Verb, bases_verbales)
+
+
+def arbre_phrase():
+    sujet = Subject(NounGroup())
+    verbe = Verb(random.choice(list(bases_verbales.values())),
+                 Tense.INDICATIVE_PRESENT, Person.THIRD_PERSON,
+                 sujet.chunks[0].number)
+    return Sentence((sujet, verbe, DirectObject(NounGroup())))
+
+
+@functools.cache
+def classe_ordinaire(classe):
+    'Dataclass sans __slots__ ni gel avec les mêmes champs que classe'
+    return dataclasses.make_dataclass(
+        classe.__name__, [champ.name for champ in dataclasses.fields(classe)])
+
+
+def copie_ordinaire(valeur):
+    '''Copie un arbre avec des dataclasses ordinaires : chaque mot est une
+    nouvelle instance et les groupes sont des listes'''
+    if isinstance(valeur, tuple):
+        return [copie_ordinaire(element) for element in valeur]
+    if isinstance(valeur, Chunk) and not isinstance(valeur, Pronoun):
+        # Les pronoms et les bases verbales restent partagés, comme avant
+        return classe_ordinaire(type(valeur))(**{
+            champ.name: copie_ordinaire(getattr(valeur, champ.name))
+            for champ in dataclasses.fields(valeur)})
+    return valeur
+
+
+def mesure(nom, n, fabrique):
+    random.seed(0)
+    tracemalloc.start()
+    arbres = [fabrique() for _ in range(n)]
+    taille, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{nom} : {len(arbres)} arbres, {taille / 2**20:.1f} Mio '
+          f'(pic {pic / 2**20:.1f} Mio), '
+          f'{taille / len(arbres):.0f} octets par arbre')
+    return taille
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=100000,
+                        help="nombre d'arbres gardés en mémoire")
+    args = parser.parse_args()
+
+    # Les premiers arbres remplissent les caches : ils ne sont pas comptés
+    for _ in range(1000):
+        copie_ordinaire(arbre_phrase())
+    reference = mesure('ordinaires', args.n,
+                       lambda: copie_ordinaire(arbre_phrase()))
+    taille = mesure('__slots__ ', args.n, arbre_phrase)
+    print(f'gain : {1 - taille / reference:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Compare le rendu en une passe des arbres de phrases (ChunkGroup.__str__,
+ChunkGroup.strings et finalise_phrase) à l'ancien rendu, qui retournait les
+listes de mots et rendait plusieurs fois les groupes imbriqués'''
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import texte  # noqa: E402
+
+
+def ancien_accord(chunk, suivant):
+    if isinstance(chunk, texte.ChunkGroup):
+        return ancien_str(chunk, suivant)
+    return chunk.match_to_following_chunk(suivant)
+
+
+def ancien_str(groupe, chunk=None):
+    iterator = iter(groupe.chunks[::-1])
+    word_list = []
+    if chunk is None:
+        prev_chunk = next(iterator)
+        word_list.append(ancien_chaine(prev_chunk))
+    else:
+        prev_chunk = chunk
+    for word in iterator:
+        word_list.append(ancien_accord(word, prev_chunk))
+        prev_chunk = word
+    return ''.join(word_list[::-1])
+
+
+def ancien_chaine(chunk):
+    if isinstance(chunk, texte.ChunkGroup):
+        return ancien_str(chunk)
+    return str(chunk)
+
+
+def ancien_strings(groupe):
+    strings = [ancien_accord(chunk, following).rstrip(' ') for chunk, following
+               in zip(groupe.chunks, groupe.chunks[1:])]
+    strings.append(ancien_chaine(groupe.chunks[-1]))
+    return strings
+
+
+def ancien_finalise_phrase(phrase):
+    phrase = ancien_strings(phrase)
+    if phrase[-1] == '?':
+        return ' '.join(phrase).replace(' , ', ', ').replace("' ", "'").capitalize().replace(' - ', '-').replace(' -t- ', '-t-')
+    else:
+        return (' '.join(phrase).replace(' , ', ', ').replace("' ", "'") + '.').capitalize()
+
+
+def compare(nom, ancien, nouveau, donnees, repetitions):
+    for d in donnees:
+        assert ancien(d) == nouveau(d), d
+    t_ancien = min(timeit.repeat(
+        lambda: [ancien(d) for d in donnees], number=1, repeat=repetitions))
+    t_nouveau = min(timeit.repeat(
+        lambda: [nouveau(d) for d in donnees], number=1, repeat=repetitions))
+    n = len(donnees)
+    print(f'{nom:<25} {t_ancien / n * 1e6:>10.2f} {t_nouveau / n * 1e6:>10.2f}'
+          f' {t_ancien / t_nouveau:>7.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=10000,
+                        help='nombre de phrases rendues par mesure')
+    parser.add_argument('-r', '--repetitions', type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    groupes = [texte.NounGroup() for _ in range(args.n)]
+    arbres = [texte.Sentence((
+        texte.Subject(texte.NounGroup()), texte.Word('mange'),
+        texte.DirectObject(texte.NounGroup()), texte.Word('?')))
+        for _ in range(args.n)]
+
+    print(f"{'rendu':<25} {'ancien (µs)':>10} {'nouveau (µs)':>10} "
+          f"{'gain':>7}")
+    compare('str(groupe nominal)', ancien_chaine, str, groupes,
+            args.repetitions)
+    compare('groupe nominal.strings()', ancien_strings,
+            texte.NounGroup.strings, groupes, args.repetitions)
+    compare('str(arbre de phrase)', ancien_chaine, str, arbres,
+            args.repetitions)
+    compare('finalise_phrase(arbre)', ancien_finalise_phrase,
+            texte.finalise_phrase, arbres, args.repetitions)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Latence des requêtes /phrase du serveur, servies depuis la réserve ou
+en générant la phrase pendant la requête'''
+
+import argparse
+import asyncio
+from pathlib import Path
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import serveur  # noqa: E402
+import texte  # noqa: E402
+
+
+class DirectServer(serveur.Server):
+    'Génère la phrase pendant la requête, sans réserve'
+
+    async def repond(self, chemin, parametres):
+        contraintes = dict(serveur.contraintes_requete(parametres))
+        phrase = texte.finalise_phrase(
+            texte.genere_phrase(**contraintes)['contenu'])
+        return 200, 'text/plain', phrase
+
+
+async def latences(classe, n, cible):
+    'Envoie n requêtes sur une connexion et renvoie leurs durées'
+    s = classe(processus=1)
+    try:
+        async with await s.demarre(port=0) as srv:
+            port = srv.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            requete = f'GET {cible} HTTP/1.1\r\nHost: local\r\n\r\n'.encode()
+            durees = []
+            for i in range(n + 1):
+                debut = time.perf_counter()
+                writer.write(requete)
+                while (ligne := await reader.readline()) != b'\r\n':
+                    if ligne.lower().startswith(b'content-length'):
+                        longueur = int(ligne.split(b':')[1])
+                await reader.readexactly(longueur)
+                durees.append(time.perf_counter() - debut)
+                if i == 0:
+                    # La première requête crée la réserve : on la laisse se
+                    # remplir avant de mesurer
+                    await asyncio.sleep(1)
+                    durees.clear()
+            writer.close()
+            await writer.wait_closed()
+            # Laisse le serveur terminer la connexion
+            await asyncio.sleep(0.01)
+            return durees
+    finally:
+        s.ferme()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=2000,
+                        help='nombre de requêtes par mesure')
+    args = parser.parse_args()
+
+    print(f"{'':<22}{'p50 (µs)':>10}{'p99 (µs)':>10}")
+    for nom, classe, cible in (
+            ('réserve', serveur.Server, '/phrase'),
+            ('réserve, contraintes', serveur.Server,
+             '/phrase?temps=imparfait&question=oui'),
+            ('génération directe', DirectServer, '/phrase')):
+        durees = asyncio.run(latences(classe, args.n, cible))
+        centiles = statistics.quantiles(durees, n=100)
+        print(f'{nom:<22}{centiles[49] * 1e6:>10.0f}'
+              f'{centiles[98] * 1e6:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
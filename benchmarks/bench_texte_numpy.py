@@ -0,0 +1,58 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'Compare la génération vectorisée de texte_numpy à genere_phrases'
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import texte  # noqa: E402
+import texte_numpy  # noqa: E402
+
+
+def mesure(fonction, n):
+    debut = time.perf_counter()
+    fonction(n)
+    return n / (time.perf_counter() - debut)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=50000,
+                        help='nombre de phrases par mesure')
+    args = parser.parse_args()
+
+    # Construit l'échantillonneur avant de mesurer
+    texte_numpy.genere_phrases(1)
+    scalaire = mesure(lambda n: list(texte.genere_phrases(n, seed=0)), args.n)
+    vectorise = mesure(lambda n: texte_numpy.genere_phrases(n, seed=0),
+                       args.n)
+    print(f'genere_phrases (scalaire) : {scalaire:>10.0f} phrases/s')
+    print(f'texte_numpy.genere_phrases : {vectorise:>10.0f} phrases/s')
+    print(f'gain : {vectorise / scalaire:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Débit de texte.genere_lot_threads de 1 à N threads. Les phrases doivent
+être les mêmes quel que soit le nombre de threads : une différence
+signalerait une situation de compétition. Le débit n'augmente qu'avec un
+CPython sans GIL (python3.13t).'''
+
+import argparse
+from pathlib import Path
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import texte  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=20000,
+                        help='nombre de phrases par mesure')
+    parser.add_argument('-t', '--threads', type=int, default=os.cpu_count(),
+                        help='nombre maximal de threads')
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"GIL {'activé' if gil else 'désactivé'}, "
+          f'{os.cpu_count()} processeurs')
+    reference = None
+    base = None
+    print(f"{'threads':>8} {'phrases/s':>10} {'accélération':>13} "
+          f"{'identiques':>11}")
+    for threads in range(1, args.threads + 1):
+        debut = time.perf_counter()
+        phrases = texte.genere_lot_threads(args.n, threads, seed=0)
+        debit = args.n / (time.perf_counter() - debut)
+        if reference is None:
+            reference, base = phrases, debit
+        print(f'{threads:>8} {debit:>10.0f} {debit / base:>12.2f}x '
+              f"{'oui' if phrases == reference else 'NON':>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Mémoire et vitesse de la génération de phrases uniques : ensemble Python
+de toutes les phrases ou filtre de Bloom'''
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import texte  # noqa: E402
+from unicite import BloomFilter  # noqa: E402
+
+
+class SetFilter:
+    'Même interface que BloomFilter, avec un ensemble'
+
+    def __init__(self):
+        self.phrases = set()
+
+    def ajoute(self, phrase):
+        if phrase in self.phrases:
+            return False
+        self.phrases.add(phrase)
+        return True
+
+    def octets(self):
+        return sys.getsizeof(self.phrases) + sum(
+            sys.getsizeof(phrase) for phrase in self.phrases)
+
+
+def mesure(n, filtre):
+    'Renvoie la durée de la génération de n phrases et la taille du filtre'
+    debut = time.perf_counter()
+    for _ in texte.genere_phrases(n, seed=0, filtre=filtre):
+        pass
+    duree = time.perf_counter() - debut
+    if isinstance(filtre, BloomFilter):
+        return duree, len(filtre.tableau)
+    return duree, filtre.octets()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'':<24}{'durée (s)':>10}{'mémoire (Mio)':>15}")
+    for nom, filtre in (
+            ('ensemble', SetFilter),
+            ('Bloom, 0,1 %', lambda: BloomFilter(args.n, 0.001)),
+            ('Bloom, 1 %', lambda: BloomFilter(args.n, 0.01))):
+        duree, memoire = mesure(args.n, filtre())
+        print(f'{nom:<24}{duree:>10.2f}{memoire / 2 ** 20:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
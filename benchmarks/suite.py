@@ -0,0 +1,170 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Suite de benchmarks des chemins critiques de la génération.
+
+Chaque mesure part d'une graine fixe. Les résultats sont écrits en JSON et
+comparés à une référence enregistrée auparavant : le script se termine en
+erreur si une mesure est plus lente que la référence de plus du seuil.
+
+    python3 benchmarks/suite.py --enregistre   # crée la référence
+    python3 benchmarks/suite.py                # compare à la référence'''
+
+import argparse
+import json
+from pathlib import Path
+import platform
+import random
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import texte  # noqa: E402
+from texte import (Adjective, Genre, Noun, NounGroup, Number,  # noqa: E402
+                   conjugaison, finalise_phrase, genere_phrase,
+                   genere_phrases)
+
+
+REFERENCE = Path(__file__).resolve().parent / 'reference.json'
+VERBES_PAR_GROUPE = {1: 'manger', 2: 'applaudir', 3: 'boire'}
+
+
+def benchmarks():
+    '''Renvoie les benchmarks sous forme de dictionnaire nom -> fonction de
+    préparation, qui renvoie la fonction à mesurer'''
+    cas = {}
+
+    for groupe, verbe in VERBES_PAR_GROUPE.items():
+        for temps in texte.temps_implementes:
+            def preparation(verbe=verbe, temps=temps):
+                return lambda: [conjugaison(verbe, p, temps)
+                                for p in range(6)]
+            cas[f'conjugaison/groupe_{groupe}/{temps}'] = preparation
+
+    for nombre in Number:
+        def preparation(nombre=nombre):
+            return lambda: NounGroup(number=nombre)
+        cas[f'groupe_nominal/{nombre.name.lower()}'] = preparation
+
+    def preparation():
+        mots = [Noun(m, g, Number.SINGULAR)
+                for g in Genre for m in texte.noms[g]]
+        mots += [Adjective(m, g, Number.SINGULAR)
+                 for g in Genre for m in texte.adjectifs[g]]
+        return lambda: [m.plural() for m in mots]
+    cas['pluriel'] = preparation
+
+    cas['genere_phrase/sans_contrainte'] = lambda: genere_phrase
+    cas['genere_phrase/contraintes'] = lambda: lambda: genere_phrase(
+        verbe='manger', adv='bien', temps='present')
+
+    def preparation():
+        phrases = [genere_phrase()['contenu'] for _ in range(100)]
+        return lambda: [finalise_phrase(p) for p in phrases]
+    cas['finalise_phrase'] = preparation
+
+    cas['corpus'] = lambda: lambda: sum(1 for _ in genere_phrases(100))
+
+    def preparation():
+        table = texte.tables_tirage['determinants', Genre.MASCULINE]
+        return lambda: [table.choice() for _ in range(100)]
+    cas['tirage/alias'] = preparation
+    return cas
+
+
+def mesure(preparation, repetitions, duree_min):
+    '''Renvoie la durée minimale d'un appel, en secondes, sur plusieurs
+    répétitions'''
+    random.seed(0)
+    fonction = preparation()
+    timer = timeit.Timer(fonction)
+    nombre, _ = timer.autorange()
+    nombre = max(nombre, int(nombre * duree_min / 0.2))
+    return min(timer.repeat(repeat=repetitions, number=nombre)) / nombre
+
+
+def compare(resultats, reference, seuil):
+    'Affiche la comparaison et renvoie la liste des régressions'
+    regressions = []
+    print(f"{'benchmark':<40} {'µs':>10} {'référence':>10} {'écart':>8}")
+    for nom, duree in resultats.items():
+        ancienne = reference.get(nom)
+        if ancienne is None:
+            print(f'{nom:<40} {duree * 1e6:>10.2f} {"-":>10} {"-":>8}')
+            continue
+        ecart = duree / ancienne - 1
+        marque = ''
+        if ecart > seuil:
+            regressions.append(nom)
+            marque = '  RÉGRESSION'
+        print(f'{nom:<40} {duree * 1e6:>10.2f} {ancienne * 1e6:>10.2f} '
+              f'{ecart:>+8.1%}{marque}')
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-k', '--filtre', default='',
+                        help='ne lance que les benchmarks contenant ce texte')
+    parser.add_argument('-r', '--repetitions', type=int, default=5)
+    parser.add_argument('-d', '--duree', type=float, default=0.2,
+                        help='durée minimale de chaque répétition (s)')
+    parser.add_argument('-s', '--seuil', type=float, default=0.1,
+                        help='ralentissement toléré (0.1 = 10 %%)')
+    parser.add_argument('--reference', type=Path, default=REFERENCE,
+                        help='fichier JSON de référence')
+    parser.add_argument('-o', '--sortie', type=Path,
+                        help='écrit les résultats dans ce fichier JSON')
+    parser.add_argument('--enregistre', action='store_true',
+                        help='enregistre les résultats comme référence')
+    args = parser.parse_args(args)
+
+    resultats = {
+        nom: mesure(preparation, args.repetitions, args.duree)
+        for nom, preparation in benchmarks().items() if args.filtre in nom
+    }
+    sortie = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'resultats': resultats,
+    }
+    if args.sortie is not None:
+        args.sortie.write_text(json.dumps(sortie, indent=1))
+
+    reference = {}
+    if args.reference.exists() and not args.enregistre:
+        reference = json.loads(args.reference.read_text())['resultats']
+    regressions = compare(resultats, reference, args.seuil)
+
+    if args.enregistre:
+        args.reference.write_text(json.dumps(sortie, indent=1))
+        print(f'Référence enregistrée dans {args.reference}')
+    if regressions:
+        print(f'{len(regressions)} régression(s) de plus de '
+              f'{args.seuil:.0%} : {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
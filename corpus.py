@@ -0,0 +1,291 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Corpus de phrases en mémoire, sous forme d'identifiants de mots.
+
+Les mots des phrases viennent d'un petit vocabulaire : chaque mot est
+stocké une fois dans un Vocabulary, et les phrases sont des suites
+d'identifiants, mises bout à bout dans un seul tableau d'entiers (array),
+avec la position de début de chaque phrase. Les phrases ne sont décodées en
+texte que quand on les lit.
+
+    corpus = Corpus.genere(1000000, seed=0)
+    questions = corpus.filtre('?')
+    print(questions[0], len(questions))
+    corpus.sauve('corpus.bin')
+    corpus = Corpus.charge('corpus.bin')
+
+Avec NumPy, le filtrage et la sélection de phrases sont vectorisés ; sans
+NumPy, ils se font avec array et bytes.find.
+
+Format binaire (petit-boutiste) : un en-tête (MAGIQUE, version, nombres de
+mots du vocabulaire, de phrases et de jetons), les mots du vocabulaire
+(nombre + 1 positions en uint32 puis les mots en UTF-8), les positions de
+début des phrases (nombre + 1, uint64) et les jetons (uint32), alignés sur
+8 octets.'''
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+import struct
+import sys
+
+from texte import finalise_phrase, genere_phrases
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MAGIQUE = b'TXTCORP\0'
+VERSION = 1
+EN_TETE = struct.Struct('<8sIQQQ')
+
+
+class Vocabulary:
+    '''Mots du corpus et leurs identifiants. Un vocabulaire peut être
+    partagé par plusieurs corpus ; il ne fait que grandir.'''
+
+    def __init__(self, mots=()):
+        self.mots = []
+        self.identifiants = {}
+        for mot in mots:
+            self.identifiant(mot)
+
+    def identifiant(self, mot):
+        'Identifiant du mot, ajouté au vocabulaire s\'il n\'y est pas'
+        i = self.identifiants.get(mot)
+        if i is None:
+            i = self.identifiants[mot] = len(self.mots)
+            self.mots.append(mot)
+        return i
+
+    def __len__(self):
+        return len(self.mots)
+
+    def __getitem__(self, i):
+        return self.mots[i]
+
+
+class Corpus(Sequence):
+    '''Phrases codées avec un vocabulaire partagé : corpus[i] est le texte
+    de la phrase i, corpus[a:b] un corpus (les jetons sont copiés, pas le
+    vocabulaire).'''
+
+    def __init__(self, vocabulaire=None, jetons=None, debuts=None):
+        self.vocabulaire = (Vocabulary() if vocabulaire is None
+                            else vocabulaire)
+        self.jetons = array('I') if jetons is None else jetons
+        self.debuts = array('Q', [0]) if debuts is None else debuts
+
+    @classmethod
+    def genere(cls, n, vocabulaire=None, **options):
+        'Corpus de n phrases générées par texte.genere_phrases(**options)'
+        corpus = cls(vocabulaire)
+        corpus.etend(genere_phrases(n, finalise=False, **options))
+        return corpus
+
+    def ajoute(self, contenu):
+        'Ajoute une phrase, donnée comme le contenu renvoyé par genere_phrase'
+        identifiant = self.vocabulaire.identifiant
+        self.jetons.extend(identifiant(mot) for mot in contenu)
+        self.debuts.append(len(self.jetons))
+
+    def etend(self, phrases):
+        for contenu in phrases:
+            self.ajoute(contenu)
+
+    def __len__(self):
+        return len(self.debuts) - 1
+
+    def _indice(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('indice de phrase hors du corpus')
+        return i
+
+    def identifiants(self, i):
+        'Identifiants des mots de la phrase i'
+        i = self._indice(i)
+        return self.jetons[self.debuts[i]:self.debuts[i + 1]]
+
+    def mots(self, i):
+        'Mots de la phrase i'
+        mots = self.vocabulaire.mots
+        return [mots[j] for j in self.identifiants(i)]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            debut, fin, pas = i.indices(len(self))
+            if pas != 1:
+                return self.selection(range(debut, fin, pas))
+            fin = max(debut, fin)
+            a, b = self.debuts[debut], self.debuts[fin]
+            debuts = self.debuts[debut:fin + 1]
+            if np is not None:
+                np.subtract(debuts, a, out=np.frombuffer(debuts, np.uint64))
+            else:
+                debuts = array('Q', (d - a for d in debuts))
+            return Corpus(self.vocabulaire, self.jetons[a:b], debuts)
+        return finalise_phrase(self.mots(i))
+
+    def selection(self, indices):
+        'Corpus des phrases dont les indices sont donnés, dans cet ordre'
+        if np is not None:
+            return self._selection_numpy(indices)
+        jetons = array('I')
+        debuts = array('Q', [0])
+        source, positions = self.jetons, self.debuts
+        n = len(self)
+        for i in indices:
+            if not -n <= i < n:
+                raise IndexError('indice de phrase hors du corpus')
+            i %= n
+            jetons += source[positions[i]:positions[i + 1]]
+            debuts.append(len(jetons))
+        return Corpus(self.vocabulaire, jetons, debuts)
+
+    def _selection_numpy(self, indices):
+        if isinstance(indices, np.ndarray):
+            indices = indices.astype(np.int64)
+        else:
+            indices = np.fromiter(indices, np.int64)
+        n = len(self)
+        if len(indices) and not (-n <= indices.min()
+                                 and indices.max() < n):
+            raise IndexError('indice de phrase hors du corpus')
+        indices %= max(n, 1)
+        positions = np.frombuffer(self.debuts, np.uint64).astype(np.int64)
+        debuts = positions[indices]
+        longueurs = positions[indices + 1] - debuts
+        nouveaux = np.zeros(len(indices) + 1, np.uint64)
+        np.cumsum(longueurs, out=nouveaux[1:])
+        # Position dans self.jetons de chaque jeton de la sélection
+        sources = (np.repeat(debuts - nouveaux[:-1].astype(np.int64),
+                             longueurs)
+                   + np.arange(int(nouveaux[-1])))
+        jetons = array('I')
+        jetons.frombytes(np.frombuffer(self.jetons, np.uint32)[sources]
+                         .tobytes())
+        debuts = array('Q')
+        debuts.frombytes(nouveaux.tobytes())
+        return Corpus(self.vocabulaire, jetons, debuts)
+
+    def indices_contenant(self, mot):
+        '''Indices (croissants) des phrases contenant le mot (une chaîne, ou
+        un identifiant du vocabulaire)'''
+        if isinstance(mot, str):
+            mot = self.vocabulaire.identifiants.get(mot)
+            if mot is None:
+                return []
+        if np is not None:
+            positions = np.flatnonzero(
+                np.frombuffer(self.jetons, np.uint32) == mot)
+            phrases = np.searchsorted(np.frombuffer(self.debuts, np.uint64),
+                                      positions, side='right') - 1
+            return np.unique(phrases).tolist()
+        indices = []
+        debuts = self.debuts
+        # Recherche des octets du jeton (bytes.find) dans ceux du tableau, à
+        # une position multiple de la taille d'un jeton ; après chaque
+        # phrase trouvée, la recherche reprend à la phrase suivante
+        taille = self.jetons.itemsize
+        octets = self.jetons.tobytes()
+        motif = array('I', [mot]).tobytes()
+        position = octets.find(motif)
+        while position >= 0:
+            if position % taille:
+                position = octets.find(motif, position + 1)
+                continue
+            phrase = bisect_right(debuts, position // taille) - 1
+            indices.append(phrase)
+            position = octets.find(motif, debuts[phrase + 1] * taille)
+        return indices
+
+    def filtre(self, mot, present=True):
+        '''Corpus des phrases contenant le mot (ou, avec present=False, ne
+        le contenant pas)'''
+        indices = self.indices_contenant(mot)
+        if not present and np is not None:
+            indices = np.setdiff1d(np.arange(len(self)), indices)
+        elif not present:
+            exclus = set(indices)
+            indices = (i for i in range(len(self)) if i not in exclus)
+        return self.selection(indices)
+
+    def nbytes(self):
+        'Taille des tableaux de jetons et de positions, en octets'
+        return (len(self.jetons) * self.jetons.itemsize
+                + len(self.debuts) * self.debuts.itemsize)
+
+    def sauve(self, chemin):
+        'Enregistre le corpus et son vocabulaire dans un fichier'
+        mots = [m.encode() for m in self.vocabulaire.mots]
+        positions = array('I', [0])
+        for m in mots:
+            positions.append(positions[-1] + len(m))
+        tableaux = [positions, b''.join(mots), self.debuts, self.jetons]
+        with open(chemin, 'wb') as f:
+            f.write(EN_TETE.pack(MAGIQUE, VERSION, len(mots), len(self),
+                                 len(self.jetons)))
+            for donnees in tableaux:
+                f.write(b'\0' * (-f.tell() % 8))
+                if isinstance(donnees, array) and sys.byteorder == 'big':
+                    donnees = array(donnees.typecode, donnees)
+                    donnees.byteswap()
+                f.write(donnees)
+
+    @classmethod
+    def charge(cls, chemin):
+        'Lit un corpus enregistré avec sauve()'
+        with open(chemin, 'rb') as f:
+            tampon = memoryview(f.read())
+        magique, version, nb_mots, nb_phrases, nb_jetons = \
+            EN_TETE.unpack_from(tampon)
+        if magique != MAGIQUE or version != VERSION:
+            raise ValueError(f"{chemin} n'est pas un corpus "
+                             f'(version {VERSION})')
+        position = EN_TETE.size
+
+        def lit(typecode, nombre):
+            nonlocal position
+            position += -position % 8
+            tableau = array(typecode)
+            fin = position + nombre * tableau.itemsize
+            tableau.frombytes(tampon[position:fin])
+            if sys.byteorder == 'big':
+                tableau.byteswap()
+            position = fin
+            return tableau
+
+        positions = lit('I', nb_mots + 1)
+        position += -position % 8
+        chaines = bytes(tampon[position:position + positions[-1]])
+        position += positions[-1]
+        vocabulaire = Vocabulary(
+            chaines[positions[i]:positions[i + 1]].decode()
+            for i in range(nb_mots))
+        debuts = lit('Q', nb_phrases + 1)
+        jetons = lit('I', nb_jetons)
+        return cls(vocabulaire, jetons, debuts)
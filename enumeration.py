@@ -0,0 +1,284 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Énumération des phrases possibles.
+
+Chaque phrase que genere_phrase peut produire reçoit un numéro entre 0 et
+len(Enumerator()) - 1 : la forme (une structure, affirmative ou
+interrogative), puis chaque choix (temps, négation, verbe, sujet,
+complément...) est un chiffre en base variable de ce numéro. Des
+structures différentes peuvent avoir la même forme interrogative
+(« sgn v adv » et « adv , sgn v ») : elle n'est numérotée qu'une fois. On
+peut ainsi retrouver une phrase à partir de son numéro seul, répartir des
+intervalles de numéros entre plusieurs processus ou parcourir les phrases
+dans un ordre mélangé sans doublon :
+
+    enumerateur = Enumerator()
+    print(len(enumerateur))
+    print(enumerateur[123456789])
+    for i in range(10):
+        print(enumerateur[enumerateur.permute(i, graine=42)])
+
+Le lexique est lu à la construction : il faut créer un nouvel énumérateur
+si le lexique de texte change.'''
+
+from bisect import bisect_right
+import hashlib
+import itertools
+import math
+import random
+
+import texte
+from texte import (Adjective, Genre, Noun, NounGroup, Number, Specifier,
+                   complement_lieu, finalise_phrase, genere_phrase)
+
+# Tours du réseau de Feistel de Enumerator.permute
+TOURS_FEISTEL = 4
+
+
+class Enumerator:
+    def __init__(self):
+        self.structures = [list(s) for s in texte.structures_phrase]
+        self.temps = list(texte.temps_implementes)
+        self.pronoms = list(texte.pronoms_personnels)
+        self.adverbes = list(texte.adverbes)
+        self.prepositions = list(texte.prepositions_lieu)
+        self.mots_negation = list(texte.mots_negation)
+        self.verbes = {'v': list(texte.verbes_non_auxiliaires),
+                       'vt': list(texte.verbes_transitifs)}
+
+        # Un bloc de groupes nominaux par genre et par nombre
+        self.blocs = []
+        for genre in Genre:
+            for nombre in Number:
+                classe = genre if nombre == Number.SINGULAR else nombre
+                self.blocs.append((genre, nombre,
+                                   list(texte.determinants[classe]),
+                                   list(texte.adjectifs[genre]),
+                                   list(texte.noms[genre])))
+        self.taille_groupe = sum(len(d) * len(a) * len(n)
+                                 for _, _, d, a, n in self.blocs)
+
+        # Formes distinctes : chaque structure à l'affirmative, puis à
+        # l'interrogative si aucune structure précédente n'a la même
+        # structure_question
+        self.formes = []
+        self._indices_formes = {}
+        for structure in self.structures:
+            for question in (False, True):
+                cle = (tuple(texte.structure_question(structure)) if question
+                       else tuple(structure))
+                if cle not in self._indices_formes:
+                    self._indices_formes[cle] = len(self.formes)
+                    self.formes.append((structure, question))
+
+        self.bases = [self._bases(s) for s, _ in self.formes]
+        self.tailles = [math.prod(b for _, b in bases) for bases in self.bases]
+        self.debuts = list(itertools.accumulate(self.tailles, initial=0))
+
+        # Pour rang() : position de chaque mot dans sa liste, le groupe
+        # nominal étant retrouvé à partir des mots accordés
+        self._positions = {
+            nom: {mot: i for i, mot in enumerate(liste)}
+            for nom, liste in (('temps', self.temps),
+                               ('pronoms', self.pronoms),
+                               ('adverbes', self.adverbes),
+                               ('prepositions', self.prepositions),
+                               ('mots_negation', self.mots_negation),
+                               ('v', self.verbes['v']),
+                               ('vt', self.verbes['vt']))}
+        self._positions_groupes = []
+        for genre, nombre, determinants, adjectifs, noms in self.blocs:
+            self._positions_groupes.append((
+                {d: i for i, d in enumerate(determinants)},
+                {self._accorde(Adjective, a, genre, nombre): i
+                 for i, a in enumerate(adjectifs)},
+                {self._accorde(Noun, n, genre, nombre): i
+                 for i, n in enumerate(noms)}))
+
+    @staticmethod
+    def _accorde(classe, mot, genre, nombre):
+        mot = classe.intern(mot, genre, Number.SINGULAR)
+        return (mot.plural() if nombre == Number.PLURAL else mot).string
+
+    def _bases(self, structure):
+        '''Nombre de possibilités de chaque choix de la structure, dans
+        l'ordre des chiffres du numéro'''
+        bases = [('temps', len(self.temps)),
+                 ('negation', 1 + len(self.mots_negation)),
+                 ('verbe', len(self.verbes['vt' if 'vt' in structure
+                                           else 'v']))]
+        for nature in structure:
+            if nature == 'pp':
+                bases.append(('sujet', len(self.pronoms)))
+            elif nature == 'sgn':
+                bases.append(('sujet', self.taille_groupe))
+            elif nature == 'cod':
+                bases.append(('cod', self.taille_groupe))
+            elif nature == 'adv':
+                bases.append(('adv', len(self.adverbes)))
+            elif nature == 'ccl':
+                bases.append(('prep', len(self.prepositions)))
+                bases.append(('ccl', self.taille_groupe))
+        return bases
+
+    def __len__(self):
+        return self.debuts[-1]
+
+    def _groupe(self, indice):
+        for genre, nombre, determinants, adjectifs, noms in self.blocs:
+            taille = len(determinants) * len(adjectifs) * len(noms)
+            if indice < taille:
+                indice, d = divmod(indice, len(determinants))
+                n, a = divmod(indice, len(adjectifs))
+                return NounGroup(
+                    nombre, genre,
+                    Specifier.intern(determinants[d], genre, nombre),
+                    Noun.intern(noms[n], genre, Number.SINGULAR),
+                    [Adjective.intern(adjectifs[a], genre, Number.SINGULAR)])
+            indice -= taille
+        raise IndexError('Numéro de groupe nominal hors limites')
+
+    def _rang_groupe(self, groupe):
+        debut = 0
+        for (genre, nombre, determinants, adjectifs, noms), positions in zip(
+                self.blocs, self._positions_groupes):
+            if (genre, nombre) == (groupe.genre, groupe.number):
+                d, a, n = positions
+                return (debut + d[groupe.specifier.string]
+                        + len(determinants) * (
+                            a[groupe.adjectives[0].string]
+                            + len(adjectifs) * n[groupe.noun.string]))
+            debut += len(determinants) * len(adjectifs) * len(noms)
+        raise ValueError(f'Groupe nominal inconnu : {groupe}')
+
+    def choix(self, indice):
+        '''Arguments de genere_phrase qui produisent la phrase numéro
+        indice, sans aucun tirage aléatoire'''
+        if not 0 <= indice < len(self):
+            raise IndexError(f'Numéro de phrase hors limites : {indice}')
+        s = bisect_right(self.debuts, indice) - 1
+        reste = indice - self.debuts[s]
+        chiffres = {}
+        for nom, base in self.bases[s]:
+            reste, chiffres[nom] = divmod(reste, base)
+
+        structure, question = self.formes[s]
+        negation = chiffres['negation']
+        arguments = {
+            'structure': structure,
+            'temps': self.temps[chiffres['temps']],
+            'question': question,
+            'negatif': bool(negation),
+            'mot_negation': (self.mots_negation[negation - 1] if negation
+                             else None),
+            'verbe': self.verbes['vt' if 'vt' in structure
+                                 else 'v'][chiffres['verbe']],
+            'sujet': (self.pronoms[chiffres['sujet']] if 'pp' in structure
+                      else self._groupe(chiffres['sujet'])),
+        }
+        if 'cod' in chiffres:
+            arguments['cod'] = self._groupe(chiffres['cod'])
+        if 'adv' in chiffres:
+            arguments['adv'] = self.adverbes[chiffres['adv']]
+        if 'ccl' in chiffres:
+            arguments['ccl'] = complement_lieu(
+                self.prepositions[chiffres['prep']],
+                self._groupe(chiffres['ccl']))
+        return arguments
+
+    def rang(self, arguments):
+        '''Numéro de la phrase décrite par arguments (l'inverse de choix()).
+        Une question peut être décrite avec une autre structure que celle
+        que choix() renvoie, si elles ont la même forme interrogative.'''
+        structure = arguments['structure']
+        s = self._indices_formes[
+            tuple(texte.structure_question(structure))
+            if arguments['question'] else tuple(structure)]
+        positions = self._positions
+        chiffres = {
+            'temps': positions['temps'][arguments['temps']],
+            'negation': (positions['mots_negation'][arguments['mot_negation']]
+                         + 1 if arguments['negatif'] else 0),
+            'verbe': positions['vt' if 'vt' in structure
+                               else 'v'][arguments['verbe']],
+            'sujet': (positions['pronoms'][arguments['sujet']]
+                      if 'pp' in structure
+                      else self._rang_groupe(arguments['sujet'])),
+        }
+        if 'cod' in structure:
+            chiffres['cod'] = self._rang_groupe(arguments['cod'])
+        if 'adv' in structure:
+            chiffres['adv'] = positions['adverbes'][arguments['adv']]
+        if 'ccl' in structure:
+            ccl = arguments['ccl']
+            prep = 'à' if ccl['prep'] in ('au', 'aux') else ccl['prep']
+            chiffres['prep'] = positions['prepositions'][prep]
+            chiffres['ccl'] = self._rang_groupe(ccl['cod'])
+
+        rang = 0
+        for nom, base in reversed(self.bases[s]):
+            rang = rang * base + chiffres[nom]
+        return self.debuts[s] + rang
+
+    def phrase(self, indice):
+        'Phrase numéro indice, sous forme de liste de mots'
+        return genere_phrase(**self.choix(indice))['contenu']
+
+    def __getitem__(self, indice):
+        return finalise_phrase(self.phrase(indice))
+
+    def permute(self, indice, graine=0):
+        '''Image de indice par une permutation pseudo-aléatoire de
+        range(len(self)) choisie par graine : parcourir permute(0),
+        permute(1)... donne toutes les phrases dans un ordre mélangé, sans
+        doublon. La permutation est un réseau de Feistel sur les numéros de
+        2k bits (tours hachés avec BLAKE2), répété tant que le résultat
+        dépasse len(self) - 1.'''
+        taille = len(self)
+        if not 0 <= indice < taille:
+            raise IndexError(f'Numéro de phrase hors limites : {indice}')
+        demi = max(1, ((taille - 1).bit_length() + 1) // 2)
+        masque = (1 << demi) - 1
+        octets = (demi + 7) // 8
+        while True:
+            gauche, droite = indice >> demi, indice & masque
+            for tour in range(TOURS_FEISTEL):
+                empreinte = hashlib.blake2b(
+                    f'{graine}:{tour}:{droite}'.encode(),
+                    digest_size=octets).digest()
+                gauche, droite = droite, gauche ^ (
+                    int.from_bytes(empreinte, 'little') & masque)
+            indice = gauche << demi | droite
+            if indice < taille:
+                return indice
+
+    def intervalle(self, debut, fin):
+        'Phrases numéro debut à fin - 1, par exemple pour un processus'
+        for indice in range(debut, fin):
+            yield self[indice]
+
+
+if __name__ == '__main__':
+    enumerateur = Enumerator()
+    print(f'{len(enumerateur)} phrases possibles')
+    for i in range(10):
+        print(enumerateur[enumerateur.permute(i, random.getrandbits(64))])
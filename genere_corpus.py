@@ -0,0 +1,161 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Génère un corpus de phrases en répartissant le travail sur plusieurs
+processus. Chaque processus écrit son propre fichier (shard) et reçoit une
+graine dérivée de la graine globale et de son numéro : deux exécutions avec
+la même graine et le même nombre de processus donnent des fichiers
+identiques.
+
+Avec --uniques, le corpus ne contient que des phrases différentes : les
+phrases sont réparties entre les shards selon leur empreinte
+(unicite.Partition), chaque shard rejette celles des autres et vérifie
+les siennes avec un filtre de Bloom (unicite.BloomFilter). Chaque
+processus génère alors environ autant de phrases que tout le corpus pour
+en garder sa part. Un shard peut être plus court que demandé si les
+phrases possibles sont épuisées.
+
+Avec --statistiques, chaque processus compte ses phrases (voir
+statistiques.py) et le rapport de l'ensemble du corpus est affiché à la
+fin.'''
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
+from pathlib import Path
+import sys
+import time
+
+from statistiques import CorpusStatistics
+from texte import genere_phrases
+from unicite import BloomFilter, Partition
+
+
+def graine_shard(graine, shard):
+    'Graine du shard numéro shard, dérivée de la graine globale'
+    empreinte = hashlib.sha256(f'{graine}:{shard}'.encode()).digest()
+    return int.from_bytes(empreinte[:8], 'little')
+
+
+def taille_shards(n, nb_shards):
+    'Répartit n phrases sur nb_shards shards'
+    return [n // nb_shards + (i < n % nb_shards) for i in range(nb_shards)]
+
+
+def chemin_shard(dossier, shard):
+    return Path(dossier) / f'corpus-{shard:04d}.txt'
+
+
+def genere_shard(dossier, shard, n, graine, uniques=False,
+                 faux_positifs=0.001, octets=None, statistiques=False,
+                 nb_shards=1):
+    '''Écrit n phrases dans le fichier du shard. Avec uniques, le shard ne
+    garde que les phrases de sa partie (sur nb_shards), toutes différentes.
+    Renvoie le numéro du shard,
+    le nombre de phrases écrites, la durée de génération, les statistiques
+    du filtre (None sans uniques) et celles des phrases (CorpusStatistics,
+    None sans statistiques).'''
+    bloom = (BloomFilter(max(n, 1), faux_positifs, octets) if uniques
+             else None)
+    filtre = (Partition(shard, nb_shards, bloom)
+              if uniques and nb_shards > 1 else bloom)
+    compteurs = CorpusStatistics() if statistiques else None
+    debut = time.perf_counter()
+    ecrites = 0
+    with open(chemin_shard(dossier, shard), 'w', encoding='utf-8') as f:
+        # Les phrases des autres parties sont aussi des rejets consécutifs
+        for phrase in genere_phrases(n, seed=graine_shard(graine, shard),
+                                     filtre=filtre,
+                                     max_rejets=1000 * nb_shards,
+                                     statistiques=compteurs):
+            f.write(phrase)
+            f.write('\n')
+            ecrites += 1
+    return (shard, ecrites, time.perf_counter() - debut,
+            bloom.statistiques() if uniques else None, compteurs)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--phrases', type=int, default=100000,
+                        help='nombre total de phrases')
+    parser.add_argument('-j', '--processus', type=int,
+                        default=os.cpu_count(),
+                        help='nombre de processus (et de shards)')
+    parser.add_argument('-s', '--graine', type=int, default=0,
+                        help='graine globale')
+    parser.add_argument('-o', '--dossier', default='corpus',
+                        help='dossier où écrire les shards')
+    parser.add_argument('-u', '--uniques', action='store_true',
+                        help='pas de phrase en double dans le corpus '
+                        '(chaque processus génère alors autant de phrases '
+                        'que tout le corpus)')
+    parser.add_argument('--faux-positifs', type=float, default=0.001,
+                        help='taux de faux positifs du filtre de --uniques')
+    parser.add_argument('--memoire', type=float,
+                        help='mémoire maximale du filtre par shard (Mio)')
+    parser.add_argument('--statistiques', action='store_true',
+                        help='affiche les statistiques du corpus')
+    args = parser.parse_args(args)
+    octets = (None if args.memoire is None
+              else int(args.memoire * 1024 * 1024))
+
+    os.makedirs(args.dossier, exist_ok=True)
+    tailles = taille_shards(args.phrases, args.processus)
+    debut = time.perf_counter()
+    with ProcessPoolExecutor(args.processus) as executor:
+        resultats = executor.map(
+            genere_shard, [args.dossier] * args.processus,
+            range(args.processus), tailles, [args.graine] * args.processus,
+            [args.uniques] * args.processus,
+            [args.faux_positifs] * args.processus, [octets] * args.processus,
+            [args.statistiques] * args.processus,
+            [args.processus] * args.processus)
+        entete = (f"{'shard':>5} {'phrases':>10} {'durée (s)':>10} "
+                  f"{'phrases/s':>12}")
+        if args.uniques:
+            entete += f" {'rejets':>8} {'remplissage':>12}"
+        print(entete, file=sys.stderr)
+        total = 0
+        corpus = None
+        for shard, n, duree, statistiques, compteurs in resultats:
+            total += n
+            if corpus is None:
+                corpus = compteurs
+            elif compteurs is not None:
+                corpus.fusionne(compteurs)
+            ligne = (f'{shard:>5} {n:>10} {duree:>10.2f} '
+                     f'{n / duree if duree else 0:>12.0f}')
+            if statistiques is not None:
+                ligne += (f" {statistiques['taux_rejet']:>8.2%}"
+                          f" {statistiques['remplissage']:>12.2%}")
+            print(ligne, file=sys.stderr)
+    duree = time.perf_counter() - debut
+    print(f"{'total':>5} {total:>10} {duree:>10.2f} "
+          f'{total / duree:>12.0f}', file=sys.stderr)
+    if corpus is not None:
+        print(file=sys.stderr)
+        print(corpus.rapport(), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
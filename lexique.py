@@ -0,0 +1,634 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+'''Lexiques compilés.
+
+Un lexique source (JSON ou CSV) est compilé en un fichier binaire en
+colonnes, qui est ensuite ouvert avec mmap : les mots ne sont décodés que
+quand ils sont tirés, sans construire de listes Python. Le temps de
+chargement et la mémoire utilisée ne dépendent donc pas de la taille du
+lexique.
+
+    python3 lexique.py exporte lexique.json
+    python3 lexique.py compile lexique.json lexique.bin
+
+puis, dans le programme :
+
+    texte.utilise_lexique(lexique.Lexique('lexique.bin'))
+
+Format JSON : le même que les données de texte.py, avec des clés en
+chaînes ("feminin", "masculin" et "pluriel" pour les genres), y compris
+les fréquences des mots (entiers positifs, 1 par défaut). Format CSV :
+une ligne d'en-tête puis une ligne par mot, avec les colonnes
+categorie (nom, adjectif, verbe, determinant ou adverbe), mot, genre
+(f, m ou p), groupe, radical, transitif, pronominal (0 ou 1), present et
+imparfait (six formes séparées par des |), participe et, facultative,
+frequence.
+
+Format binaire (petit-boutiste) : un en-tête (MAGIQUE, version, nombre de
+sections), une table des sections (nom, type, nombre d'éléments, position)
+puis les sections, alignées sur 8 octets. Une colonne de chaînes est un
+tableau de n + 1 positions (uint32) suivi des chaînes en UTF-8 ; les
+colonnes d'attributs sont des tableaux de uint8, de uint32 ou de float64.
+Les tables d'alias des tirages pondérés (voir texte.calcule_alias) et les
+tables morphologie des noms, adjectifs et déterminants (voir
+texte.construit_morphologie) sont calculées à la compilation ; chaque table
+morphologie est rangée en colonnes triées par mot.'''
+
+import argparse
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+import csv
+import functools
+import json
+import mmap
+from pathlib import Path
+import struct
+import sys
+
+import texte
+from texte import Genre, Number
+
+
+MAGIQUE = b'TXTLEX\0\0'
+VERSION = 6
+EN_TETE = struct.Struct('<8sII')
+TAILLE_NOM_SECTION = 32
+ENTREE_SECTION = struct.Struct(f'<{TAILLE_NOM_SECTION}sIIQ')
+
+CHAINES, UINT8, UINT32, FLOAT64 = range(4)
+TYPES_ATTRIBUTS = {UINT8: 'B', UINT32: 'I', FLOAT64: 'd'}
+SANS_CONJUGAISONS = 0xFFFFFFFF
+# Formes stockées pour un verbe du troisième groupe : six au présent, six à
+# l'imparfait et le participe passé
+FORMES_3E = 13
+
+GENRES = {'feminin': Genre.FEMININE, 'masculin': Genre.MASCULINE}
+CLASSES_DETERMINANTS = {**GENRES, 'pluriel': Number.PLURAL}
+GENRES_CSV = {'f': 'feminin', 'm': 'masculin', 'p': 'pluriel'}
+CATEGORIES_CSV = {'nom': 'noms', 'adjectif': 'adjectifs',
+                  'determinant': 'determinants', 'adverbe': 'adverbes',
+                  'verbe': 'verbes'}
+
+if sys.byteorder != 'little':
+    raise ImportError('Les lexiques compilés ne sont lus que sur les '
+                      'machines petit-boutistes')
+
+
+# Source
+
+def exporte_lexique_integre():
+    'Renvoie le lexique intégré à texte.py au format JSON source'
+    noms_genres = {g: nom for nom, g in CLASSES_DETERMINANTS.items()}
+    verbes = {}
+    for infinitif, cara in texte.verbes.items():
+        verbe = dict(cara)
+        if cara['groupe'] == 3:
+            verbe['conjugaisons'] = texte.conjug_3e[infinitif]
+        verbes[infinitif] = verbe
+    return {
+        'noms': {noms_genres[g]: list(mots)
+                 for g, mots in texte.noms.items()},
+        'adjectifs': {noms_genres[g]: list(mots)
+                      for g, mots in texte.adjectifs.items()},
+        'determinants': {noms_genres[c]: list(mots)
+                         for c, mots in texte.determinants.items()},
+        'adverbes': list(texte.adverbes),
+        'verbes': verbes,
+        'frequences': {categorie: dict(f)
+                       for categorie, f in texte.frequences.items()},
+    }
+
+
+def importe_source(source):
+    '''Variables de texte.py (noms, adjectifs, determinants, adverbes,
+    verbes, conjug_3e et frequences) du lexique source au format JSON :
+    l'inverse de exporte_lexique_integre'''
+    verbes, conjug_3e = {}, {}
+    for infinitif, cara in source['verbes'].items():
+        cara = dict(cara)
+        conjugaisons = cara.pop('conjugaisons', None)
+        if conjugaisons is not None:
+            conjug_3e[infinitif] = conjugaisons
+        verbes[infinitif] = cara
+    return {
+        'noms': {g: list(source['noms'].get(nom, []))
+                 for nom, g in GENRES.items()},
+        'adjectifs': {g: list(source['adjectifs'].get(nom, []))
+                      for nom, g in GENRES.items()},
+        'determinants': {c: list(source['determinants'].get(nom, []))
+                         for nom, c in CLASSES_DETERMINANTS.items()},
+        'adverbes': list(source['adverbes']),
+        'verbes': verbes,
+        'conjug_3e': conjug_3e,
+        'frequences': {categorie: dict(f) for categorie, f
+                       in source.get('frequences', {}).items()},
+    }
+
+
+def lit_csv(chemin):
+    'Lit un lexique source au format CSV'
+    source = {'noms': {}, 'adjectifs': {}, 'determinants': {},
+              'adverbes': [], 'verbes': {}, 'frequences': {}}
+    with open(chemin, newline='', encoding='utf-8') as f:
+        for ligne in csv.DictReader(f):
+            categorie, mot = ligne['categorie'], ligne['mot']
+            if ligne.get('frequence'):
+                section = CATEGORIES_CSV[categorie]
+                source['frequences'].setdefault(section, {})[mot] = int(
+                    ligne['frequence'])
+            if categorie == 'adverbe':
+                source['adverbes'].append(mot)
+            elif categorie == 'verbe':
+                verbe = {
+                    'groupe': int(ligne['groupe']),
+                    'radical': ligne['radical'],
+                    'transitif': ligne['transitif'] == '1',
+                    'pronominal': ligne['pronominal'] == '1',
+                }
+                if verbe['groupe'] == 3:
+                    verbe['conjugaisons'] = {
+                        'indicatif': {
+                            'present': ligne['present'].split('|'),
+                            'imparfait': ligne['imparfait'].split('|'),
+                        },
+                        'participe': {'passe': ligne['participe']},
+                    }
+                source['verbes'][mot] = verbe
+            else:
+                genre = GENRES_CSV[ligne['genre']]
+                source[CATEGORIES_CSV[categorie]].setdefault(
+                    genre, []).append(mot)
+    return source
+
+
+def lit_source(chemin):
+    if Path(chemin).suffix == '.csv':
+        return lit_csv(chemin)
+    with open(chemin, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Compilation
+
+def _colonne_chaines(chaines):
+    donnees = [c.encode('utf-8') for c in chaines]
+    positions = [0]
+    for d in donnees:
+        positions.append(positions[-1] + len(d))
+    return (struct.pack(f'<{len(positions)}I', *positions)
+            + b''.join(donnees))
+
+
+def _sections(source):
+    'Renvoie les sections du fichier compilé : (nom, type, nombre, données)'
+    sections = []
+
+    def chaines(nom, liste):
+        sections.append((nom, CHAINES, len(liste), _colonne_chaines(liste)))
+
+    def attributs(nom, type_, valeurs):
+        sections.append((nom, type_, len(valeurs), struct.pack(
+            f'<{len(valeurs)}{TYPES_ATTRIBUTS[type_]}', *valeurs)))
+
+    frequences = source.get('frequences', {})
+
+    def poids(nom, categorie, liste):
+        # Les poids ne sont écrits que pour les catégories qui en ont
+        if not frequences.get(categorie):
+            return None
+        valeurs = [frequences[categorie].get(m, 1) for m in liste]
+        attributs(f'{nom}.poids', UINT32, valeurs)
+        return valeurs
+
+    def alias(nom, poids):
+        # Table d'alias du tirage de la colonne nom, s'il n'est pas uniforme
+        tables = None if poids is None else texte.calcule_alias(poids)
+        if tables is not None:
+            attributs(f'{nom}.seuils', FLOAT64, tables[0])
+            attributs(f'{nom}.alias', UINT32, tables[1])
+
+    for genre in GENRES:
+        for categorie in ('noms', 'adjectifs'):
+            mots = source[categorie].get(genre, [])
+            chaines(f'{categorie}.{genre}', mots)
+            alias(f'{categorie}.{genre}',
+                  poids(f'{categorie}.{genre}', categorie, mots))
+    for classe in CLASSES_DETERMINANTS:
+        mots = source['determinants'].get(classe, [])
+        chaines(f'determinants.{classe}', mots)
+        alias(f'determinants.{classe}',
+              poids(f'determinants.{classe}', 'determinants', mots))
+    chaines('adverbes', source['adverbes'])
+    alias('adverbes', poids('adverbes', 'adverbes', source['adverbes']))
+
+    # Les verbes transitifs sont rangés en premier pour pouvoir tirer un
+    # verbe transitif dans un intervalle d'indices
+    verbes = sorted(source['verbes'].items(),
+                    key=lambda v: (not v[1]['transitif'], v[0]))
+    chaines('verbes', [infinitif for infinitif, _ in verbes])
+    poids_verbes = poids('verbes', 'verbes',
+                         [infinitif for infinitif, _ in verbes])
+    if poids_verbes is not None:
+        alias('verbes.transitifs',
+              [p for p, (_, cara) in zip(poids_verbes, verbes)
+               if cara['transitif']])
+        alias('verbes.non_auxiliaires',
+              [p for p, (infinitif, _) in zip(poids_verbes, verbes)
+               if infinitif not in ('être', 'avoir')])
+    chaines('verbes.radical', [cara['radical'] for _, cara in verbes])
+    attributs('verbes.groupe', UINT8, [cara['groupe'] for _, cara in verbes])
+    attributs('verbes.transitif', UINT8,
+              [cara['transitif'] for _, cara in verbes])
+    attributs('verbes.pronominal', UINT8,
+              [cara['pronominal'] for _, cara in verbes])
+    # Indices des verbes dans l'ordre alphabétique, pour les recherches
+    attributs('verbes.ordre', UINT32, sorted(
+        range(len(verbes)), key=lambda i: verbes[i][0]))
+
+    morphologie = texte.construit_morphologie(
+        *({c: source[categorie].get(nom, []) for nom, c in classes.items()}
+          for categorie, classes in (('noms', GENRES), ('adjectifs', GENRES),
+                                     ('determinants',
+                                      CLASSES_DETERMINANTS))))
+    for categorie, table in morphologie.items():
+        mots = sorted(table)
+        chaines(f'formes.{categorie}', mots)
+        chaines(f'formes.{categorie}.pluriel',
+                [table[m].plural for m in mots])
+        chaines(f'formes.{categorie}.elision',
+                [table[m].before_vowel for m in mots])
+
+    conjugaisons = []
+    indices = []
+    for _, cara in verbes:
+        if cara['groupe'] != 3:
+            indices.append(SANS_CONJUGAISONS)
+            continue
+        c = cara['conjugaisons']
+        indices.append(len(conjugaisons) // FORMES_3E)
+        conjugaisons.extend(c['indicatif']['present'])
+        conjugaisons.extend(c['indicatif']['imparfait'])
+        conjugaisons.append(c['participe']['passe'])
+    attributs('verbes.conjugaisons', UINT32, indices)
+    chaines('conjugaisons', conjugaisons)
+    return sections
+
+
+def compile_lexique(source, destination):
+    '''Compile le lexique source (chemin d'un fichier JSON ou CSV, ou
+    dictionnaire au format JSON) dans le fichier destination'''
+    if not isinstance(source, dict):
+        source = lit_source(source)
+    sections = _sections(source)
+
+    position = EN_TETE.size + ENTREE_SECTION.size * len(sections)
+    table = []
+    for nom, type_, nombre, donnees in sections:
+        if len(nom.encode()) > TAILLE_NOM_SECTION:
+            raise ValueError(f'Nom de section trop long : {nom}')
+        position += -position % 8
+        table.append((nom, type_, nombre, position, donnees))
+        position += len(donnees)
+
+    with open(destination, 'wb') as f:
+        f.write(EN_TETE.pack(MAGIQUE, VERSION, len(sections)))
+        for nom, type_, nombre, position, _ in table:
+            f.write(ENTREE_SECTION.pack(nom.encode(), type_, nombre,
+                                        position))
+        for _, _, _, position, donnees in table:
+            f.write(b'\0' * (position - f.tell()))
+            f.write(donnees)
+
+
+# Lecture
+
+class StringColumn(Sequence):
+    'Colonne de chaînes lue directement dans le fichier projeté en mémoire'
+
+    def __init__(self, tampon, nombre, position):
+        self._positions = tampon[position:position + 4 * (nombre + 1)].cast(
+            'I')
+        self._debut = position + 4 * (nombre + 1)
+        self._tampon = tampon
+        self._nombre = nombre
+
+    def __len__(self):
+        return self._nombre
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._nombre))]
+        if i < 0:
+            i += self._nombre
+        if not 0 <= i < self._nombre:
+            raise IndexError(i)
+        debut = self._debut + self._positions[i]
+        fin = self._debut + self._positions[i + 1]
+        return str(self._tampon[debut:fin], 'utf-8')
+
+
+class SequenceView(Sequence):
+    '''Vue sur les indices debut:fin d'une colonne, en sautant les indices
+    exclus'''
+
+    def __init__(self, colonne, debut, fin, exclus=(), contient=None):
+        self._colonne = colonne
+        self._debut = debut
+        self._exclus = sorted(i for i in exclus if debut <= i < fin)
+        self._nombre = fin - debut - len(self._exclus)
+        self._contient = contient
+
+    def __len__(self):
+        return self._nombre
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._nombre))]
+        if i < 0:
+            i += self._nombre
+        if not 0 <= i < self._nombre:
+            raise IndexError(i)
+        i += self._debut
+        for exclu in self._exclus:
+            if exclu <= i:
+                i += 1
+        return self._colonne[i]
+
+    def __contains__(self, mot):
+        if self._contient is not None:
+            return self._contient(mot)
+        return super().__contains__(mot)
+
+
+class VerbMapping(Mapping):
+    '''Verbes du lexique, sous la même forme que texte.verbes : infinitif ->
+    {'groupe', 'radical', 'transitif', 'pronominal'}, plus 'conjugaisons'
+    pour les verbes du troisième groupe'''
+
+    def __init__(self, lexique):
+        self._lexique = lexique
+
+    def __len__(self):
+        return len(self._lexique.colonne('verbes'))
+
+    def __iter__(self):
+        return iter(self._lexique.colonne('verbes'))
+
+    def __contains__(self, infinitif):
+        return self._lexique.indice_verbe(infinitif) is not None
+
+    def __getitem__(self, infinitif):
+        i = self._lexique.indice_verbe(infinitif)
+        if i is None:
+            raise KeyError(infinitif)
+        return self._lexique.verbe(i)
+
+
+class ConjugationTables(Mapping):
+    '''Tables de conjugaison des verbes du lexique, calculées à la demande et
+    gardées dans un cache LRU'''
+
+    def __init__(self, verbes, taille_cache=1024):
+        self._verbes = verbes
+        self._table = functools.lru_cache(taille_cache)(self._calcule)
+
+    def _calcule(self, infinitif):
+        cara = self._verbes[infinitif]
+        conjugaisons = None
+        if cara['groupe'] == 3:
+            conjugaisons = texte.convert_conjugations(cara['conjugaisons'])
+        return texte.table_conjugaison(texte._base_verbale(
+            infinitif, cara['groupe'], cara['radical'], cara['transitif'],
+            cara['pronominal'], conjugaisons))
+
+    def __len__(self):
+        return len(self._verbes)
+
+    def __iter__(self):
+        return iter(self._verbes)
+
+    def __contains__(self, infinitif):
+        return infinitif in self._verbes
+
+    def __getitem__(self, infinitif):
+        if infinitif not in self._verbes:
+            raise KeyError(infinitif)
+        return self._table(infinitif)
+
+
+class MorphologyTable(Mapping):
+    '''Table morphologie d'une catégorie de mots (noms, adjectifs ou
+    determinants) d'un lexique compilé : mot -> texte.WordForms, lue dans
+    les colonnes par recherche dichotomique. Les formes lues sont gardées
+    dans un cache LRU.'''
+
+    def __init__(self, lexique, categorie, taille_cache=4096):
+        self._lexique = lexique
+        self._nom = f'formes.{categorie}'
+        self._mots = lexique.colonne(self._nom)
+        self.get = functools.lru_cache(taille_cache)(self._cherche)
+
+    def _cherche(self, mot, defaut=None):
+        if not isinstance(mot, str):
+            return defaut
+        i = bisect_left(self._mots, mot)
+        if i == len(self._mots) or self._mots[i] != mot:
+            return defaut
+        return self._formes(i)
+
+    def _formes(self, i):
+        colonne = self._lexique.colonne
+        return texte.WordForms(colonne(f'{self._nom}.pluriel')[i],
+                               colonne(f'{self._nom}.elision')[i])
+
+    def __len__(self):
+        return len(self._mots)
+
+    def __iter__(self):
+        return iter(self._mots)
+
+    def __contains__(self, mot):
+        return self.get(mot) is not None
+
+    def __getitem__(self, mot):
+        formes = self.get(mot)
+        if formes is None:
+            raise KeyError(mot)
+        return formes
+
+    def items(self):
+        return ((mot, self._formes(i)) for i, mot in enumerate(self._mots))
+
+
+class Lexique:
+    '''Lexique compilé, projeté en mémoire. Ses attributs remplacent les
+    données de texte.py (voir texte.utilise_lexique).'''
+
+    def __init__(self, chemin):
+        with open(chemin, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._tampon = memoryview(self._mmap)
+        magique, version, nombre = EN_TETE.unpack_from(self._tampon)
+        if magique != MAGIQUE or version != VERSION:
+            raise ValueError(f"{chemin} n'est pas un lexique compilé "
+                             f'(version {VERSION})')
+        self._sections = {}
+        for i in range(nombre):
+            nom, type_, n, position = ENTREE_SECTION.unpack_from(
+                self._tampon, EN_TETE.size + i * ENTREE_SECTION.size)
+            self._sections[nom.rstrip(b'\0').decode()] = (type_, n, position)
+        self._colonnes = {}
+        self.indice_verbe = functools.lru_cache(4096)(self._indice_verbe)
+
+        self.noms = {g: self.colonne(f'noms.{nom}')
+                     for nom, g in GENRES.items()}
+        self.adjectifs = {g: self.colonne(f'adjectifs.{nom}')
+                          for nom, g in GENRES.items()}
+        self.determinants = {c: self.colonne(f'determinants.{nom}')
+                             for nom, c in CLASSES_DETERMINANTS.items()}
+        self.adverbes = self.colonne('adverbes')
+
+        verbes = self.colonne('verbes')
+        self.verbes = VerbMapping(self)
+        nb_transitifs = bisect_left(self.colonne('verbes.transitif'), 0,
+                                    key=lambda t: -t)
+        auxiliaires = [self.indice_verbe(v) for v in ('être', 'avoir')]
+        self.verbes_transitifs = SequenceView(
+            verbes, 0, nb_transitifs, contient=self._est_transitif)
+        self.verbes_non_auxiliaires = SequenceView(
+            verbes, 0, len(verbes),
+            exclus=[i for i in auxiliaires if i is not None],
+            contient=lambda v: (v not in ('être', 'avoir')
+                                and v in self.verbes))
+        self.tables_conjugaison = ConjugationTables(self.verbes)
+
+        poids_verbes = self.poids('verbes')
+        self.tables_tirage = {
+            'verbes_transitifs': self._table_tirage(
+                'verbes.transitifs', self.verbes_transitifs,
+                None if poids_verbes is None
+                else poids_verbes[:nb_transitifs]),
+            'verbes_non_auxiliaires': self._table_tirage(
+                'verbes.non_auxiliaires', self.verbes_non_auxiliaires,
+                None if poids_verbes is None
+                else SequenceView(poids_verbes, 0, len(poids_verbes),
+                                  exclus=[i for i in auxiliaires
+                                          if i is not None])),
+            'adverbes': self._table_tirage('adverbes', self.adverbes,
+                                           self.poids('adverbes')),
+        }
+        for categorie, classes in (('noms', GENRES), ('adjectifs', GENRES),
+                                   ('determinants', CLASSES_DETERMINANTS)):
+            for nom, c in classes.items():
+                nom = f'{categorie}.{nom}'
+                self.tables_tirage[categorie, c] = self._table_tirage(
+                    nom, self.colonne(nom), self.poids(nom))
+
+        self.morphologie = {categorie: MorphologyTable(self, categorie)
+                            for categorie in ('noms', 'adjectifs',
+                                              'determinants')}
+
+    def colonne(self, nom):
+        colonne = self._colonnes.get(nom)
+        if colonne is None:
+            type_, n, position = self._sections[nom]
+            if type_ == CHAINES:
+                colonne = StringColumn(self._tampon, n, position)
+            else:
+                taille = struct.calcsize(TYPES_ATTRIBUTS[type_])
+                colonne = self._tampon[position:position + n * taille].cast(
+                    TYPES_ATTRIBUTS[type_])
+            self._colonnes[nom] = colonne
+        return colonne
+
+    def poids(self, nom):
+        'Poids des mots de la colonne nom, ou None si elle n\'en a pas'
+        if f'{nom}.poids' not in self._sections:
+            return None
+        return self.colonne(f'{nom}.poids')
+
+    def _table_tirage(self, nom, elements, poids):
+        '''Table de tirage des elements, avec la table d'alias nom calculée
+        à la compilation (tirage uniforme si elle n'existe pas)'''
+        if f'{nom}.alias' not in self._sections:
+            return texte.AliasTable(elements)
+        return texte.AliasTable.precalculee(
+            elements, poids, self.colonne(f'{nom}.seuils'),
+            self.colonne(f'{nom}.alias'))
+
+    def _indice_verbe(self, infinitif):
+        'Indice du verbe dans les colonnes de verbes, ou None'
+        if not isinstance(infinitif, str):
+            return None
+        verbes = self.colonne('verbes')
+        ordre = self.colonne('verbes.ordre')
+        i = bisect_left(ordre, infinitif, key=verbes.__getitem__)
+        if i < len(ordre) and verbes[ordre[i]] == infinitif:
+            return ordre[i]
+        return None
+
+    def _est_transitif(self, infinitif):
+        i = self.indice_verbe(infinitif)
+        return i is not None and bool(self.colonne('verbes.transitif')[i])
+
+    def verbe(self, i):
+        'Caractéristiques du verbe numéro i, au format de texte.verbes'
+        cara = {
+            'groupe': self.colonne('verbes.groupe')[i],
+            'radical': self.colonne('verbes.radical')[i],
+            'transitif': bool(self.colonne('verbes.transitif')[i]),
+            'pronominal': bool(self.colonne('verbes.pronominal')[i]),
+        }
+        j = self.colonne('verbes.conjugaisons')[i]
+        if j != SANS_CONJUGAISONS:
+            formes = self.colonne('conjugaisons')[
+                j * FORMES_3E:(j + 1) * FORMES_3E]
+            cara['conjugaisons'] = {
+                'indicatif': {'present': formes[0:6],
+                              'imparfait': formes[6:12]},
+                'participe': {'passe': formes[12]},
+            }
+        return cara
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Exporte ou compile un lexique')
+    commandes = parser.add_subparsers(dest='commande', required=True)
+    exporte = commandes.add_parser(
+        'exporte', help='exporte le lexique intégré au format JSON')
+    exporte.add_argument('destination')
+    compile_ = commandes.add_parser(
+        'compile', help='compile un lexique JSON ou CSV')
+    compile_.add_argument('source')
+    compile_.add_argument('destination')
+    args = parser.parse_args(args)
+
+    if args.commande == 'exporte':
+        with open(args.destination, 'w', encoding='utf-8') as f:
+            json.dump(exporte_lexique_integre(), f, ensure_ascii=False,
+                      indent=1)
+    else:
+        compile_lexique(args.source, args.destination)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,494 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Génération de phrases d'une longueur donnée, sans tirer de phrases pour
+rien.
+
+La longueur d'une phrase (en caractères ou en mots) est la somme des
+longueurs de ses éléments : verbe conjugué, groupes nominaux, adverbe...
+Pour chaque élément, les mots possibles sont regroupés par longueur, en
+tenant compte des élisions (« l' », « n' », « j' », « bel »), des pluriels et
+de la ponctuation. Les longueurs atteignables sont des entiers utilisés comme
+ensembles de bits : élément après élément, seules les longueurs avec
+lesquelles la phrase peut encore entrer dans l'intervalle sont tirées.
+
+    texte.genere_phrase(min_len=20, max_len=30)
+    texte.genere_phrases(100, min_len=5, max_len=6, unite='mots')
+
+Les mots sont comptés sans la ponctuation ; « n' », « j' » et « l' »
+comptent comme des mots. Les phrases sont tirées parmi celles de la bonne
+longueur avec des probabilités proches de celles de genere_phrase, sans
+leur être exactement proportionnelles.'''
+
+from collections import OrderedDict
+import random
+import threading
+
+import texte
+from texte import (AliasTable, GENRES, NUMBERS, VOWELS, Adjective, Noun,
+                   NounGroup, Number, Specifier)
+
+
+def mesure_caracteres(jeton):
+    '''Nombre de caractères ajoutés à la phrase finalisée par le mot jeton,
+    espace suivante comprise'''
+    if jeton.endswith("'"):
+        return len(jeton)
+    if jeton == ',':
+        # « a , b » devient « a, b »
+        return 1
+    if jeton in ('-', '-t-'):
+        # « a - b » devient « a-b »
+        return len(jeton) - 1
+    return len(jeton) + 1
+
+
+def mesure_mots(jeton):
+    if jeton in (',', '?', '-', '-t-'):
+        return 0
+    return jeton.count(' ') + 1
+
+
+UNITES = {'caracteres': mesure_caracteres, 'mots': mesure_mots}
+
+
+def mesure(phrase, unite='caracteres'):
+    '''Longueur de la phrase, donnée comme le contenu renvoyé par
+    genere_phrase, dans l'unité voulue'''
+    total = sum(map(UNITES[unite], phrase))
+    if unite == 'caracteres' and phrase[-1] == '?':
+        # Pas de point final après le point d'interrogation
+        total -= 1
+    return total
+
+
+def jetons_verbe(forme, negatif, mot_negation, question, pronom):
+    '''Mots de la phrase qui dépendent du verbe conjugué forme : négation et
+    tiret de l'inversion'''
+    jetons = []
+    if negatif:
+        jetons.append("n'" if texte.voyelle_initiale(forme) else 'ne')
+    jetons.append(forme)
+    if negatif and not (question and pronom is not None):
+        jetons.append(mot_negation)
+    if question and pronom is not None:
+        jetons.append('-t-' if pronom[0] in VOWELS and forme[-1] not in 'dt'
+                      else '-')
+    return jetons
+
+
+def _somme(a, b):
+    "Ensemble des sommes d'un élément de a et d'un élément de b"
+    resultat = 0
+    while a:
+        bas = a & -a
+        resultat |= b << (bas.bit_length() - 1)
+        a ^= bas
+    return resultat
+
+
+def _atteint(ensemble, minimum, maximum):
+    'Vrai si ensemble contient une valeur entre minimum et maximum'
+    minimum = max(minimum, 0)
+    maximum = min(maximum, ensemble.bit_length())
+    if maximum < minimum:
+        return False
+    return bool((ensemble >> minimum) & ((1 << (maximum - minimum + 1)) - 1))
+
+
+def _probabilites(table):
+    "Éléments et probabilités d'une table de tirage de texte"
+    poids = (table.poids if table.poids is not None
+             else [1] * len(table.elements))
+    total = sum(poids)
+    return [(e, p / total) for e, p in zip(table.elements, poids)]
+
+
+def _classes(elements, cle):
+    '''Regroupe les (élément, probabilité) selon cle(élément) :
+    {clé: (table de tirage, probabilité totale)}'''
+    groupes = {}
+    for element, p in elements:
+        mots, poids = groupes.setdefault(cle(element), ([], []))
+        mots.append(element)
+        poids.append(p)
+    return {c: (AliasTable(mots, poids), sum(poids))
+            for c, (mots, poids) in groupes.items()}
+
+
+class LengthClasses:
+    '''Valeurs possibles d'un élément de la phrase, regroupées par mesure :
+    une table de tirage et un poids total par mesure, et l'ensemble (en
+    bits) des mesures possibles'''
+    __slots__ = ('tables', 'poids', 'ensemble')
+
+    def __init__(self, candidats):
+        par_mesure = {}
+        for m, element, p in candidats:
+            if p > 0:
+                elements, poids = par_mesure.setdefault(m, ([], []))
+                elements.append(element)
+                poids.append(p)
+        self.tables = {m: AliasTable(elements, poids)
+                       for m, (elements, poids) in par_mesure.items()}
+        self.poids = {m: sum(poids) for m, (_, poids) in par_mesure.items()}
+        self.ensemble = 0
+        for m in par_mesure:
+            self.ensemble |= 1 << m
+
+
+class LengthPlanner:
+    '''Mesures des éléments des phrases dans une unité (caracteres ou mots),
+    calculées à partir du lexique actuel de texte la première fois qu'elles
+    servent'''
+
+    def __init__(self, unite='caracteres'):
+        if unite not in UNITES:
+            raise ValueError(f'Unité inconnue : {unite}')
+        self.unite = unite
+        self.tables_tirage = texte.tables_tirage
+        self.tables_structures = texte.tables_structures
+        self._elements = {}
+        self._ensembles = {}
+        self._plans = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def mesure(self, jetons):
+        return sum(map(UNITES[self.unite], jetons))
+
+    def mesure_verbe(self, forme, negatif, mot_negation, question, pronom):
+        '''Mesure des mots qui dépendent du verbe conjugué forme, élision de
+        « je » comprise'''
+        m = self.mesure(jetons_verbe(forme, negatif, mot_negation, question,
+                                     pronom))
+        if (pronom == 'je' and texte.voyelle_initiale(forme) and not negatif
+                and not question):
+            m += self.mesure(["j'"]) - self.mesure(['je'])
+        return m
+
+    def _element(self, cle, candidats):
+        classes = self._elements.get(cle)
+        if classes is None:
+            # Une seule instance par clé : ensemble() identifie les éléments
+            # par leur id
+            classes = self._elements.setdefault(cle,
+                                                LengthClasses(candidats()))
+        return classes
+
+    def groupe_nominal(self, nombres, prep=None):
+        '''Groupes nominaux d'un des nombres donnés, précédés de la
+        préposition prep (« au » et « aux » compris)'''
+        return self._element(('gn', nombres, prep),
+                             lambda: self._groupes(nombres, prep))
+
+    def _groupes(self, nombres, prep):
+        mesure = self.mesure
+        p_groupe = 1 / (len(GENRES) * len(nombres))
+        for genre in GENRES:
+            for nombre in nombres:
+                pluriel = nombre == Number.PLURAL
+
+                def accorde(classe, mot):
+                    mot = classe.intern(mot, genre, Number.SINGULAR)
+                    return mot.plural() if pluriel else mot
+
+                def cle_nom(n):
+                    n = accorde(Noun, n)
+                    return (texte.voyelle_initiale(n.string),
+                            mesure([n.string]))
+
+                def cle_adjectif(a):
+                    a = accorde(Adjective, a)
+                    if not a.before_noun:
+                        return False, False, *(2 * (mesure([a.string]),))
+                    return (True, texte.voyelle_initiale(a.string),
+                            *(mesure([a.match_to_following_string(i)
+                                      .rstrip(' ')]) for i in 'ab'))
+
+                def jetons_determinant(d, initiale):
+                    forme = Specifier(d, genre, nombre) \
+                        .match_to_following_string(initiale).rstrip(' ')
+                    if prep is None:
+                        return [forme]
+                    if prep == 'à' and forme in ('le', 'les'):
+                        return ['au' if forme == 'le' else 'aux']
+                    return [prep, forme]
+
+                noms = _classes(
+                    _probabilites(self.tables_tirage['noms', genre]),
+                    cle_nom)
+                adjectifs = _classes(
+                    _probabilites(self.tables_tirage['adjectifs', genre]),
+                    cle_adjectif)
+                determinants = _classes(
+                    _probabilites(self.tables_tirage[
+                        'determinants', nombre if pluriel else genre]),
+                    lambda d: tuple(mesure(jetons_determinant(d, i))
+                                    for i in 'ab'))
+
+                for (voyelle, m_nom), (t_nom, p_nom) in noms.items():
+                    for (avant, voyelle_adj, *m_adj), (t_adj, p_adj) in \
+                            adjectifs.items():
+                        suivant = voyelle_adj if avant else voyelle
+                        for m_det, (t_det, p_det) in determinants.items():
+                            yield (m_nom + m_adj[not voyelle]
+                                   + m_det[not suivant],
+                                   (genre, nombre, t_nom, t_adj, t_det),
+                                   p_groupe * p_nom * p_adj * p_det)
+
+    def complement_lieu(self):
+        def candidats():
+            prepositions = texte.prepositions_lieu
+            for prep in prepositions:
+                gn = self.groupe_nominal(NUMBERS, prep)
+                for m, table in gn.tables.items():
+                    for element, p in _probabilites(table):
+                        yield (m, (prep, element),
+                               gn.poids[m] * p / len(prepositions))
+        return self._element(('ccl',), candidats)
+
+    def adverbe(self):
+        return self._element(('adv',), lambda: (
+            (self.mesure([a]), a, p)
+            for a, p in _probabilites(self.tables_tirage['adverbes'])))
+
+    def verbe(self, verbes, temps, personne, negatif, mot_negation,
+              question, pronom):
+        '''Verbes de la table de tirage verbes, conjugués, avec la négation,
+        le tiret de l'inversion et l'élision de « je » qu'ils entraînent'''
+        def candidats():
+            for infinitif, p in _probabilites(self.tables_tirage[verbes]):
+                forme = texte.conjugaison(infinitif, personne, temps)
+                yield self.mesure_verbe(
+                    forme, negatif, mot_negation, question, pronom), \
+                    infinitif, p
+        return self._element(
+            ('v', verbes, temps, personne, negatif, mot_negation, question,
+             pronom), candidats)
+
+    def ensemble(self, elements):
+        'Ensemble des mesures possibles de la somme des éléments'
+        cle = tuple(map(id, elements))
+        ensemble = self._ensembles.get(cle)
+        if ensemble is None:
+            ensemble = 1
+            for element in elements:
+                ensemble = _somme(element.ensemble, ensemble)
+            self._ensembles[cle] = ensemble
+        return ensemble
+
+    def plan(self, min_len=None, max_len=None, **contraintes):
+        '''LengthPlan des phrases mesurant entre min_len et max_len (inclus)
+        avec les contraintes de genere_phrase. Les derniers plans servis
+        sont gardés ; les threads peuvent partager un LengthPlanner.'''
+        cle = (min_len, max_len, tuple(sorted(contraintes.items())))
+        try:
+            hash(cle)
+        except TypeError:
+            # Contrainte non hashable (verbe ou ccl en dict)
+            return LengthPlan(self, min_len, max_len, contraintes)
+        with self._verrou:
+            plan = self._plans.get(cle)
+            if plan is None:
+                plan = self._plans[cle] = LengthPlan(self, min_len, max_len,
+                                                     contraintes)
+                if len(self._plans) > 64:
+                    self._plans.popitem(last=False)
+            else:
+                self._plans.move_to_end(cle)
+        return plan
+
+    def cadres(self, structure=None, temps=None, question=None, negatif=None,
+               mot_negation=None, sujet=None, verbe=None, cod=None, adv=None,
+               ccl=None):
+        '''Énumère les cadres de phrase compatibles avec les contraintes,
+        tirés comme dans genere_phrase : (arguments de genere_phrase fixés,
+        poids, mesure des mots fixes, éléments restant à tirer)'''
+        if structure is not None:
+            structures = [(structure, 1)]
+        else:
+            structures = _probabilites(self.tables_structures[
+                texte.masque_contraintes(sujet, verbe, cod, adv, ccl)])
+        liste_temps = [temps] if temps is not None else texte.liste_temps
+        questions = ([(question, 1)] if question is not None
+                     else [(False, 2), (True, 1)])
+        mots_negation = texte.mots_negation
+        if negatif is None and mot_negation is None:
+            negations = [(False, None, len(mots_negation))] + [
+                (True, m, 1) for m in mots_negation]
+        elif negatif:
+            negations = ([(True, mot_negation, 1)] if mot_negation is not None
+                         else [(True, m, 1) for m in mots_negation])
+        else:
+            negations = [(False, None, 1)]
+
+        for structure, p_structure in structures:
+            for q, p_question in questions:
+                natures = (texte.structure_question(structure) if q
+                           else structure)
+                if sujet is not None:
+                    sujets = [sujet]
+                elif 'pp' in natures:
+                    sujets = texte.pronoms_sujets
+                else:
+                    sujets = NUMBERS
+                for t in liste_temps:
+                    for neg, mot, p_negation in negations:
+                        for s in sujets:
+                            yield self._cadre(
+                                natures, s, verbe, cod, adv, ccl,
+                                p_structure * p_question * p_negation
+                                / len(liste_temps) / len(sujets),
+                                structure=structure, temps=t, question=q,
+                                negatif=neg, mot_negation=mot)
+
+    def _cadre(self, natures, sujet, verbe, cod, adv, ccl, poids,
+               **arguments):
+        temps, question, negatif, mot_negation = (
+            arguments['temps'], arguments['question'], arguments['negatif'],
+            arguments['mot_negation'])
+        fixes = -1 if question and self.unite == 'caracteres' else 0
+        elements = []
+        pronom = None
+        if isinstance(sujet, Number):
+            personne = 2 if sujet == Number.SINGULAR else 5
+            elements.append(('sujet', self.groupe_nominal((sujet,))))
+        else:
+            arguments['sujet'] = sujet
+            if isinstance(sujet, str):
+                pronom = sujet
+                personne = texte.pronoms_personnels[sujet]
+            else:
+                personne = 2 if sujet.number == Number.SINGULAR else 5
+                fixes += self.mesure(sujet.strings())
+
+        if verbe is None:
+            elements.append(('verbe', self.verbe(
+                'verbes_non_auxiliaires' if 'v' in natures
+                else 'verbes_transitifs',
+                temps, personne, negatif, mot_negation, question, pronom)))
+        else:
+            arguments['verbe'] = verbe
+            fixes += self.mesure_verbe(
+                texte.conjugaison(verbe, personne, temps), negatif,
+                mot_negation, question, pronom)
+
+        for nature in natures:
+            if nature == 'pp':
+                fixes += self.mesure([pronom])
+                if question and negatif:
+                    fixes += self.mesure([mot_negation])
+            elif nature == 'cod':
+                if cod is None:
+                    elements.append(('cod', self.groupe_nominal(NUMBERS)))
+                else:
+                    arguments['cod'] = cod
+                    fixes += self.mesure(cod.strings())
+            elif nature == 'adv':
+                if adv is None:
+                    elements.append(('adv', self.adverbe()))
+                else:
+                    arguments['adv'] = adv
+                    fixes += self.mesure([adv])
+            elif nature == 'ccl':
+                if ccl is None:
+                    elements.append(('ccl', self.complement_lieu()))
+                else:
+                    arguments['ccl'] = ccl
+                    fixes += self.mesure(ccl['contenu'])
+            elif nature in (',', '?', 'Est-ce que'):
+                fixes += self.mesure([nature])
+        return arguments, poids, fixes, elements
+
+
+def _groupe_nominal(element, rng):
+    genre, nombre, noms, adjectifs, determinants = element
+    return NounGroup(
+        nombre, genre,
+        Specifier.intern(determinants.choice(rng), genre, nombre),
+        Noun.intern(noms.choice(rng), genre, Number.SINGULAR),
+        [Adjective.intern(adjectifs.choice(rng), genre, Number.SINGULAR)])
+
+
+class LengthPlan:
+    '''Cadres de phrase pouvant mesurer entre min_len et max_len, et tirage
+    des arguments de genere_phrase pour une phrase de cette longueur'''
+
+    def __init__(self, planificateur, min_len, max_len, contraintes):
+        self.min_len = 0 if min_len is None else min_len
+        self.max_len = float('inf') if max_len is None else max_len
+        cadres, poids = [], []
+        for arguments, p, fixes, elements in \
+                planificateur.cadres(**contraintes):
+            classes = [c for _, c in elements]
+            suffixes = [planificateur.ensemble(classes[i:])
+                        for i in range(len(classes) + 1)]
+            if _atteint(suffixes[0], self.min_len - fixes,
+                        self.max_len - fixes):
+                cadres.append((arguments, fixes, elements, suffixes))
+                poids.append(p)
+        if not cadres:
+            raise ValueError(
+                f'Aucune phrase ne mesure entre {min_len} et {max_len} '
+                f'{planificateur.unite}')
+        self.cadres = AliasTable(cadres, poids)
+
+    def arguments(self, rng=random):
+        '''Arguments de genere_phrase pour une phrase de la bonne longueur,
+        tirés avec rng'''
+        arguments, fixes, elements, suffixes = self.cadres.choice(rng)
+        arguments = dict(arguments)
+        minimum, maximum = self.min_len - fixes, self.max_len - fixes
+        for i, (nom, classes) in enumerate(elements):
+            suite = suffixes[i + 1]
+            mesures = [m for m in classes.tables
+                       if _atteint(suite, minimum - m, maximum - m)]
+            m, = rng.choices(mesures, [classes.poids[m] for m in mesures])
+            minimum -= m
+            maximum -= m
+            element = classes.tables[m].choice(rng)
+            if nom in ('sujet', 'cod'):
+                element = _groupe_nominal(element, rng)
+            elif nom == 'ccl':
+                element = texte.complement_lieu(
+                    element[0], _groupe_nominal(element[1], rng))
+            arguments[nom] = element
+        return arguments
+
+
+_planificateurs = {}
+_verrou_planificateurs = threading.Lock()
+
+
+def planificateur(unite='caracteres'):
+    '''LengthPlanner de l'unité, recalculé quand le lexique ou les
+    structures de texte ont changé (texte.utilise_lexique)'''
+    with _verrou_planificateurs:
+        p = _planificateurs.get(unite)
+        if (p is None or p.tables_tirage is not texte.tables_tirage
+                or p.tables_structures is not texte.tables_structures):
+            p = _planificateurs[unite] = LengthPlanner(unite)
+        return p
+
+
+def plan(min_len=None, max_len=None, unite='caracteres', **contraintes):
+    'Voir LengthPlanner.plan'
+    return planificateur(unite).plan(min_len, max_len, **contraintes)
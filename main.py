@@ -1,3 +1,6 @@
+import queue
+import threading
+
 import kivy
 from kivy.app import App
 from kivy.uix.button import Button
@@ -6,13 +9,40 @@ from kivy.uix.boxlayout import BoxLayout
 
 from texte import genere_phrase, finalise_phrase
 
+# Nombre de phrases préparées à l'avance
+TAILLE_FILE = 8
+
+
+def nouvelle_phrase():
+    return finalise_phrase(genere_phrase()['contenu'])
+
+
 class TexteApp(App):
+    def producteur(self):
+        'Remplit la file de phrases en arrière-plan jusqu\'à l\'arrêt'
+        while not self.arret.is_set():
+            phrase = nouvelle_phrase()
+            while not self.arret.is_set():
+                try:
+                    self.file.put(phrase, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
     def callback(self, instance):
         self.label.text_size = self.label.size
-        self.label.text = finalise_phrase(genere_phrase()['contenu'])
+        try:
+            self.label.text = self.file.get_nowait()
+        except queue.Empty:
+            # Seulement si le bouton est pressé plus vite que la file ne se
+            # remplit
+            self.label.text = nouvelle_phrase()
         return
 
     def build(self):
+        self.file = queue.Queue(TAILLE_FILE)
+        self.arret = threading.Event()
+        self.thread = threading.Thread(target=self.producteur, daemon=True)
         box = BoxLayout(orientation='vertical')
         b = Button(text='Klikit warnon', height=50, size_hint_y=None)
         self.label = Label(font_size=30)
@@ -23,4 +53,11 @@ class TexteApp(App):
         b.bind(on_press=self.callback)
         return box
 
+    def on_start(self):
+        self.thread.start()
+
+    def on_stop(self):
+        self.arret.set()
+        self.thread.join()
+
 TexteApp().run()
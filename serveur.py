@@ -0,0 +1,318 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Serveur HTTP de génération de phrases (bibliothèque standard uniquement).
+
+    python3 serveur.py --port 8000
+
+GET /phrase renvoie une phrase en texte brut, GET /phrases?n=10 une liste
+de phrases en JSON et GET /etat le remplissage des réserves. Les paramètres
+temps, negatif, question et verbe sont passés à genere_phrase comme
+contraintes, par exemple /phrase?temps=imparfait&question=oui.
+
+Les requêtes ne génèrent rien : elles prennent des phrases dans une réserve
+(une par combinaison de contraintes), remplie en arrière-plan par des
+processus de travail dès qu'elle descend sous sa capacité.'''
+
+import argparse
+import asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import random
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+import texte
+
+
+BOOLEENS = {'1': True, 'true': True, 'oui': True,
+            '0': False, 'false': False, 'non': False}
+STATUTS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 503: 'Service Unavailable'}
+
+
+class RequestError(ValueError):
+    'Requête invalide, renvoyée au client avec le statut 400'
+
+
+class PoolClosedError(RuntimeError):
+    'Réserve abandonnée pendant qu\'une requête attendait ses phrases'
+
+
+def initialise_processus():
+    '''Initialise un processus de travail : nouvelle graine (sinon les
+    processus créés par fork tireraient tous les mêmes phrases) et priorité
+    plus basse, pour que la boucle du serveur ne leur cède pas le processeur'''
+    random.seed()
+    if hasattr(os, 'nice'):
+        os.nice(10)
+
+
+def genere_lot(n, contraintes):
+    'Exécuté dans un processus de travail : génère n phrases finalisées'
+    return list(texte.genere_phrases(n, **dict(contraintes)))
+
+
+def contraintes_requete(parametres):
+    '''Convertit les paramètres de la requête en contraintes pour
+    genere_phrase, sous forme de tuple trié (utilisable comme clé)'''
+    contraintes = {}
+    for nom, valeurs in parametres.items():
+        valeur = valeurs[-1]
+        if nom == 'temps':
+            if valeur not in texte.temps_implementes:
+                raise RequestError(f'Temps inconnu : {valeur}')
+            contraintes[nom] = valeur
+        elif nom in ('negatif', 'question'):
+            if valeur.lower() not in BOOLEENS:
+                raise RequestError(f'Valeur booléenne invalide pour {nom} : '
+                                   f'{valeur}')
+            contraintes[nom] = BOOLEENS[valeur.lower()]
+        elif nom == 'verbe':
+            if valeur not in texte.verbes:
+                raise RequestError(f'Verbe inconnu : {valeur}')
+            contraintes[nom] = valeur
+        elif nom != 'n':
+            raise RequestError(f'Paramètre inconnu : {nom}')
+    return tuple(sorted(contraintes.items()))
+
+
+class Pool:
+    '''Réserve de phrases générées avec les mêmes contraintes. Dès que le
+    nombre de phrases (disponibles ou en cours de génération) descend sous
+    la capacité, des lots sont demandés aux processus de travail.'''
+
+    def __init__(self, contraintes, capacite, lot, executor):
+        self.contraintes = contraintes
+        self.capacite = capacite
+        self.lot = lot
+        self.executor = executor
+        self.phrases = deque()
+        self.en_attente = 0
+        self.erreur = None
+        self.fermee = False
+        self.condition = asyncio.Condition()
+        self._taches = set()
+
+    def remplit(self):
+        '''Demande assez de lots pour revenir à la capacité, sans la
+        dépasser (le dernier lot est raccourci)'''
+        while not self.fermee:
+            taille = min(self.lot, self.capacite - len(self.phrases)
+                         - self.en_attente)
+            if taille <= 0:
+                return
+            self.en_attente += taille
+            tache = asyncio.create_task(self._genere(taille))
+            self._taches.add(tache)
+            tache.add_done_callback(self._taches.discard)
+
+    async def _genere(self, taille):
+        boucle = asyncio.get_running_loop()
+        phrases = []
+        try:
+            phrases = await boucle.run_in_executor(
+                self.executor, genere_lot, taille, self.contraintes)
+        except Exception as erreur:
+            self.erreur = erreur
+        finally:
+            # Aussi quand la tâche est annulée (voir annule) : les requêtes
+            # en attente doivent être réveillées
+            async with self.condition:
+                self.en_attente -= taille
+                self.phrases.extend(phrases)
+                self.condition.notify_all()
+
+    async def prends(self, n):
+        '''Prend n phrases, en attendant le remplissage si nécessaire.
+        Lève PoolClosedError si la réserve est abandonnée entre-temps.'''
+        phrases = []
+        async with self.condition:
+            while True:
+                while self.phrases and len(phrases) < n:
+                    phrases.append(self.phrases.popleft())
+                if len(phrases) == n:
+                    self.remplit()
+                    return phrases
+                if self.fermee:
+                    raise PoolClosedError('Réserve abandonnée')
+                self.remplit()
+                await self.condition.wait_for(
+                    lambda: self.phrases or self.erreur or self.fermee)
+                if self.erreur is not None:
+                    erreur, self.erreur = self.erreur, None
+                    raise erreur
+
+    def annule(self):
+        '''Abandonne la réserve : les lots en cours sont annulés et les
+        requêtes en attente échouent avec PoolClosedError'''
+        self.fermee = True
+        for tache in self._taches:
+            tache.cancel()
+        tache = asyncio.get_running_loop().create_task(self._reveille())
+        self._taches.add(tache)
+        tache.add_done_callback(self._taches.discard)
+
+    async def _reveille(self):
+        async with self.condition:
+            self.condition.notify_all()
+
+
+class Server:
+    '''Serveur HTTP/1.1 minimal avec une réserve par combinaison de
+    contraintes (au plus nb_reserves, les moins récemment utilisées sont
+    abandonnées).'''
+
+    def __init__(self, capacite=1000, lot=100, processus=None,
+                 nb_reserves=32, lot_max=1000):
+        self.capacite = capacite
+        self.lot = lot
+        self.nb_reserves = nb_reserves
+        self.lot_max = lot_max
+        self.executor = ProcessPoolExecutor(
+            processus, initializer=initialise_processus)
+        self.reserves = OrderedDict()
+
+    def reserve(self, contraintes):
+        if contraintes in self.reserves:
+            self.reserves.move_to_end(contraintes)
+            return self.reserves[contraintes]
+        reserve = Pool(contraintes, self.capacite, self.lot, self.executor)
+        self.reserves[contraintes] = reserve
+        if len(self.reserves) > self.nb_reserves:
+            _, ancienne = self.reserves.popitem(last=False)
+            ancienne.annule()
+        reserve.remplit()
+        return reserve
+
+    async def repond(self, chemin, parametres):
+        'Renvoie le statut, le type et le corps de la réponse'
+        if chemin == '/etat':
+            etat = [{'contraintes': dict(r.contraintes),
+                     'phrases': len(r.phrases), 'en_attente': r.en_attente}
+                    for r in self.reserves.values()]
+            return 200, 'application/json', json.dumps(etat)
+        if chemin not in ('/phrase', '/phrases'):
+            return 404, 'text/plain', 'Chemin inconnu'
+        reserve = self.reserve(contraintes_requete(parametres))
+        if chemin == '/phrase':
+            phrase, = await reserve.prends(1)
+            return 200, 'text/plain', phrase
+        try:
+            n = int(parametres.get('n', ['10'])[-1])
+        except ValueError:
+            raise RequestError('n doit être un entier') from None
+        if not 0 < n <= self.lot_max:
+            raise RequestError(f'n doit être compris entre 1 et '
+                               f'{self.lot_max}')
+        phrases = await reserve.prends(n)
+        return 200, 'application/json', json.dumps(phrases,
+                                                   ensure_ascii=False)
+
+    async def connexion(self, reader, writer):
+        'Traite les requêtes d\'une connexion (keep-alive)'
+        try:
+            while True:
+                ligne = await reader.readline()
+                if not ligne:
+                    break
+                methode, cible, version = ligne.decode('latin-1').split()
+                entetes = {}
+                while (ligne := await reader.readline()) not in (b'\r\n',
+                                                                 b'\n', b''):
+                    nom, _, valeur = ligne.decode('latin-1').partition(':')
+                    entetes[nom.strip().lower()] = valeur.strip().lower()
+                garde = (entetes.get('connection') != 'close'
+                         if version == 'HTTP/1.1'
+                         else entetes.get('connection') == 'keep-alive')
+
+                if methode != 'GET':
+                    statut, type_, corps = 405, 'text/plain', 'GET uniquement'
+                else:
+                    url = urlsplit(cible)
+                    try:
+                        statut, type_, corps = await self.repond(
+                            url.path, parse_qs(url.query))
+                    except RequestError as erreur:
+                        statut, type_, corps = 400, 'text/plain', str(erreur)
+                    except Exception as erreur:
+                        statut, type_, corps = 503, 'text/plain', repr(erreur)
+                corps = corps.encode()
+                writer.write(
+                    f'HTTP/1.1 {statut} {STATUTS[statut]}\r\n'
+                    f'Content-Type: {type_}; charset=utf-8\r\n'
+                    f'Content-Length: {len(corps)}\r\n'
+                    f'Connection: {"keep-alive" if garde else "close"}\r\n'
+                    '\r\n'.encode() + corps)
+                await writer.drain()
+                if not garde:
+                    break
+        except (ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def demarre(self, hote='127.0.0.1', port=8000):
+        'Démarre le serveur et remplit la réserve sans contraintes'
+        self.reserve(())
+        return await asyncio.start_server(self.connexion, hote, port)
+
+    def ferme(self):
+        for reserve in self.reserves.values():
+            reserve.annule()
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def sert(args):
+    serveur = Server(args.capacite, args.lot, args.processus)
+    try:
+        async with await serveur.demarre(args.hote, args.port) as s:
+            adresse = s.sockets[0].getsockname()
+            print(f'Serveur sur http://{adresse[0]}:{adresse[1]}/',
+                  file=sys.stderr)
+            await s.serve_forever()
+    finally:
+        serveur.ferme()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Serveur HTTP de génération de phrases')
+    parser.add_argument('--hote', default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=8000)
+    parser.add_argument('-c', '--capacite', type=int, default=1000,
+                        help='nombre de phrases gardées par réserve')
+    parser.add_argument('-l', '--lot', type=int, default=100,
+                        help='nombre de phrases générées par tâche')
+    parser.add_argument('-j', '--processus', type=int,
+                        default=os.cpu_count(),
+                        help='nombre de processus de travail')
+    args = parser.parse_args(args)
+    try:
+        asyncio.run(sert(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Statistiques d'un corpus, calculées au fil de la génération.
+
+    statistiques = CorpusStatistics()
+    for phrase in texte.genere_phrases(1000000, statistiques=statistiques):
+        ...
+    print(statistiques.rapport())
+
+Les compteurs portent sur des ensembles bornés (structures, temps,
+personnes, mots du lexique, verbe × temps × personne) et le nombre de
+phrases différentes est estimé avec un HyperLogLog : la mémoire utilisée ne
+dépend pas du nombre de phrases. Les statistiques de plusieurs processus se
+combinent avec fusionne().'''
+
+from collections import Counter
+import heapq
+
+import texte
+from texte import NounGroup, Number, finalise_phrase
+from unicite import HyperLogLog
+
+CATEGORIES = ('verbes', 'noms', 'adjectifs', 'determinants', 'adverbes')
+
+
+def _pourcentage(n, total):
+    return f'{n / total:.1%}' if total else '-'
+
+
+def _singuliers_possibles(pluriel):
+    'Formes dont pluriel peut être le pluriel (voir PluralMixin.plural)'
+    yield pluriel[:-1]
+    if pluriel.endswith('aux'):
+        yield pluriel[:-3] + 'al'
+        yield pluriel[:-3] + 'ail'
+    yield pluriel
+
+
+def _distincts(listes):
+    'Mots de listes, chacun une seule fois, dans l\'ordre'
+    vus = set()
+    for liste in listes:
+        for mot in liste:
+            if mot not in vus:
+                vus.add(mot)
+                yield mot
+
+
+def _couverture(mots, compteur, nb_mots):
+    '''Nombre de mots, nombre de mots utilisés et les nb_mots moins
+    utilisés, en un seul parcours de mots'''
+    total = utilises = 0
+
+    def compte(mot):
+        nonlocal total, utilises
+        total += 1
+        utilises += compteur[mot] > 0
+        return mot
+
+    rares = heapq.nsmallest(nb_mots, map(compte, mots),
+                            key=lambda m: (compteur[m], m))
+    return total, utilises, rares
+
+
+class CorpusStatistics:
+    '''Compte, pour les phrases ajoutées, les structures, temps, personnes,
+    négations, combinaisons verbe × temps × personne et l'usage des mots du
+    lexique, et estime le nombre de phrases différentes'''
+
+    def __init__(self, precision=14):
+        self.nb_phrases = 0
+        self.structures = Counter()
+        self.temps = Counter()
+        self.personnes = Counter()
+        self.questions = 0
+        self.negations = Counter()
+        self.conjugaisons = Counter()
+        self.mots = {categorie: Counter() for categorie in CATEGORIES}
+        self.distinctes = HyperLogLog(precision)
+        # Forme au singulier des noms et adjectifs au pluriel rencontrés
+        self._singuliers = {'noms': {}, 'adjectifs': {}}
+
+    def ajoute(self, phrase, rendu=None):
+        '''Compte une phrase, donnée comme le résultat de genere_phrase ;
+        rendu est son texte finalisé s'il est déjà calculé'''
+        self.nb_phrases += 1
+        self.structures[tuple(phrase['structure'])] += 1
+        self.temps[phrase['temps']] += 1
+        self.personnes[phrase['personne']] += 1
+        self.questions += bool(phrase['question'])
+        negation = phrase['negation']
+        self.negations[negation['mot'] if negation['negatif'] else None] += 1
+        infinitif = phrase['verbe']['infinitif']
+        if isinstance(infinitif, dict):
+            infinitif = infinitif['infinitif']
+        self.mots['verbes'][infinitif] += 1
+        self.conjugaisons[infinitif, phrase['temps'], phrase['personne']] += 1
+        if phrase['adv'] is not None:
+            self.mots['adverbes'][phrase['adv']] += 1
+        ccl = phrase['ccl']
+        for groupe in (phrase['sujet']['contenu'], phrase['cod'],
+                       ccl and ccl['cod']):
+            if isinstance(groupe, NounGroup):
+                self._ajoute_groupe(groupe)
+        if rendu is None:
+            rendu = finalise_phrase(phrase['contenu'])
+        self.distinctes.ajoute(rendu)
+
+    def _singulier(self, categorie, pluriel):
+        '''Mot du lexique dont pluriel est le pluriel, cherché dans la table
+        morphologie à la première rencontre seulement'''
+        singuliers = self._singuliers[categorie]
+        singulier = singuliers.get(pluriel)
+        if singulier is None:
+            table = texte.morphologie[categorie]
+            singulier = singuliers[pluriel] = next(
+                (mot for mot in _singuliers_possibles(pluriel)
+                 if getattr(table.get(mot), 'plural', None) == pluriel),
+                pluriel)
+        return singulier
+
+    def _ajoute_groupe(self, groupe):
+        mots = self.mots
+        mots['determinants'][groupe.specifier.string] += 1
+        nom = groupe.noun.string
+        adjectifs = [adjectif.string for adjectif in groupe.adjectives]
+        if groupe.number == Number.PLURAL:
+            nom = self._singulier('noms', nom)
+            adjectifs = [self._singulier('adjectifs', adjectif)
+                         for adjectif in adjectifs]
+        mots['noms'][nom] += 1
+        for adjectif in adjectifs:
+            mots['adjectifs'][adjectif] += 1
+
+    def fusionne(self, autre):
+        'Ajoute les statistiques de autre (de même précision)'
+        self.nb_phrases += autre.nb_phrases
+        self.questions += autre.questions
+        for nom in ('structures', 'temps', 'personnes', 'negations',
+                    'conjugaisons'):
+            getattr(self, nom).update(getattr(autre, nom))
+        for categorie in CATEGORIES:
+            self.mots[categorie].update(autre.mots[categorie])
+        self.distinctes.fusionne(autre.distinctes)
+
+    @staticmethod
+    def lexique():
+        '''Mots pouvant être tirés, par catégorie, dans le lexique actuel :
+        des itérables parcourus à la demande, sans copie du lexique'''
+        return {
+            'verbes': texte.verbes_non_auxiliaires,
+            'noms': _distincts(texte.noms.values()),
+            'adjectifs': _distincts(texte.adjectifs.values()),
+            'determinants': _distincts(texte.determinants.values()),
+            'adverbes': texte.adverbes,
+        }
+
+    def rapport(self, nb_mots=5):
+        '''Rapport en texte : distributions, couverture des conjugaisons et
+        du lexique (avec les nb_mots mots les moins utilisés)'''
+        n = self.nb_phrases
+        lignes = [f'{n} phrases, environ {self.distinctes.estimation():.0f} '
+                  f'différentes (± {self.distinctes.erreur_relative:.1%}), '
+                  f'{_pourcentage(self.questions, n)} de questions']
+
+        def distribution(titre, compteur, noms=str):
+            lignes.append('')
+            lignes.append(titre)
+            for cle, nombre in compteur.most_common():
+                lignes.append(f'  {noms(cle):<40} {nombre:>10} '
+                              f'{_pourcentage(nombre, n):>7}')
+
+        distribution('Structures', self.structures, ' '.join)
+        distribution('Temps', self.temps,
+                     lambda t: texte.temps_implementes.get(t, t))
+        distribution('Personnes', self.personnes,
+                     lambda p: f"{('1re', '2e', '3e')[p % 3]} personne du "
+                               f"{'pluriel' if p >= 3 else 'singulier'}")
+        distribution('Négation', self.negations,
+                     lambda m: 'pas de négation' if m is None else m)
+
+        lexique = self.lexique()
+        verbes = lexique['verbes']
+        possibles = len(verbes) * len(texte.liste_temps) * 6
+        vues = sum(1 for verbe, _, _ in self.conjugaisons if verbe in verbes)
+        lignes.append('')
+        lignes.append(f'Verbe × temps × personne : {vues} / {possibles} '
+                      f'({_pourcentage(vues, possibles)})')
+
+        lignes.append('')
+        lignes.append('Lexique')
+        for categorie in CATEGORIES:
+            compteur = self.mots[categorie]
+            total, utilises, rares = _couverture(lexique[categorie],
+                                                 compteur, nb_mots)
+            lignes.append(
+                f'  {categorie:<13} {utilises:>6} / {total:<6} '
+                f'({_pourcentage(utilises, total)}) ; moins utilisés : '
+                + ', '.join(f'{m} ({compteur[m]})' for m in rares))
+        return '\n'.join(lignes)
@@ -0,0 +1,72 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import serveur  # noqa: E402
+
+
+class PoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Le seul thread de travail est bloqué : les lots restent en attente
+        self.executor = ThreadPoolExecutor(1)
+        self.debloque = threading.Event()
+        self.executor.submit(self.debloque.wait)
+        self.serveur = serveur.Server(capacite=20, lot=10, processus=1,
+                                      nb_reserves=1)
+        self.serveur.executor.shutdown()
+        self.serveur.executor = self.executor
+
+    async def asyncTearDown(self):
+        self.debloque.set()
+        self.executor.shutdown()
+
+    async def test_capacite(self):
+        reserve = self.serveur.reserve(())
+        self.assertEqual(reserve.en_attente, 20)
+        reserve.remplit()
+        self.assertEqual(reserve.en_attente, 20)
+
+    async def test_abandon_pendant_une_attente(self):
+        reserve = self.serveur.reserve(())
+        attente = asyncio.create_task(reserve.prends(1))
+        await asyncio.sleep(0.01)
+        self.assertFalse(attente.done())
+        # Une autre combinaison de contraintes évince la réserve
+        self.serveur.reserve((('temps', 'present'),))
+        with self.assertRaises(serveur.PoolClosedError):
+            await asyncio.wait_for(attente, 1)
+        await asyncio.sleep(0.01)
+        self.assertEqual(reserve.en_attente, 0)
+        with self.assertRaises(serveur.PoolClosedError):
+            await reserve.prends(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
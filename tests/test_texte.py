@@ -0,0 +1,87 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+
+from pathlib import Path
+import random
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lexique  # noqa: E402
+import longueurs  # noqa: E402
+import texte  # noqa: E402
+
+
+class ElisionTest(unittest.TestCase):
+    def test_je_inverse_sans_elision(self):
+        'Pas de « j\' » quand le sujet est inversé : « Ai-je », « Aimé-je »'
+        for verbe in texte.verbes_non_auxiliaires:
+            for temps in texte.temps_implementes:
+                resultat = texte.genere_phrase(
+                    sujet='je', verbe=verbe, temps=temps, question=True,
+                    negatif=False, rng=random.Random(0))
+                self.assertNotIn("j'", resultat['contenu'])
+                self.assertIn('-je', texte.finalise_phrase(
+                    resultat['contenu']))
+
+    def test_je_elide_hors_question(self):
+        resultat = texte.genere_phrase(
+            sujet='je', verbe='avoir', temps='present', question=False,
+            negatif=False, structure=['pp', 'vt', 'cod'])
+        self.assertTrue(texte.finalise_phrase(
+            resultat['contenu']).startswith("J'ai "))
+
+    def test_longueur_questions_je(self):
+        'Les longueurs planifiées sont celles des phrases générées'
+        for unite, (minimum, maximum) in (('caracteres', (20, 35)),
+                                          ('mots', (4, 6))):
+            for contenu in texte.genere_phrases(
+                    300, seed=0, finalise=False, sujet='je', question=True,
+                    negatif=False, min_len=minimum, max_len=maximum,
+                    unite=unite):
+                longueur = longueurs.mesure(contenu, unite)
+                self.assertTrue(minimum <= longueur <= maximum)
+                if unite == 'caracteres':
+                    self.assertEqual(
+                        len(texte.finalise_phrase(contenu)), longueur)
+
+class MorphologieTest(unittest.TestCase):
+    def tearDown(self):
+        texte.utilise_source(lexique.exporte_lexique_integre())
+
+    def test_nom_ecrit_comme_un_determinant(self):
+        source = lexique.exporte_lexique_integre()
+        source['noms']['masculin'] += ['son', 'ton']
+        texte.utilise_source(source)
+        for nom in ('son', 'ton'):
+            mot = texte.Noun(nom, texte.Genre.MASCULINE,
+                             texte.Number.SINGULAR)
+            self.assertEqual(mot.plural().string, nom + 's')
+        determinant = texte.Specifier('ma', texte.Genre.FEMININE,
+                                      texte.Number.SINGULAR)
+        self.assertEqual(determinant.match_to_following_string('arrivée'),
+                         'mon ')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lexique  # noqa: E402
+import texte  # noqa: E402
+import texte_numpy  # noqa: E402
+
+
+class LexiqueCompileTest(unittest.TestCase):
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        chemin = Path(dossier.name) / 'lexique.bin'
+        lexique.compile_lexique(lexique.exporte_lexique_integre(), chemin)
+        texte.utilise_lexique(lexique.Lexique(chemin))
+
+    def tearDown(self):
+        texte.utilise_source(lexique.exporte_lexique_integre())
+
+    def test_echantillonneur(self):
+        'Le lexique compilé donne des séquences, pas des listes'
+        echantillonneur = texte_numpy.BatchSampler()
+        self.assertEqual(
+            len(echantillonneur.verbes),
+            len(texte.verbes_non_auxiliaires) + len(texte.verbes_transitifs))
+        tirages = echantillonneur.sample(200, np.random.default_rng(0))
+        phrases = [texte.finalise_phrase(phrase)
+                   for phrase in echantillonneur.assemble(tirages)]
+        self.assertEqual(len(phrases), 200)
+        for phrase in phrases:
+            self.assertRegex(phrase, r'^[A-ZÀ-Ü].*[.?]$')
+
+
+if __name__ == '__main__':
+    unittest.main()
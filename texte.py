@@ -21,18 +21,37 @@
 # allows `def func(self, arg: Class)` inside of Class
 from __future__ import annotations
 
-import dataclasses
+import atexit
 from dataclasses import dataclass
 from enum import Enum, auto
+import functools
+import hashlib
+import itertools
+import os
+import pickle
 import random
 import re
+import sys
+import time
+import tracemalloc
+import types
 import typing
 
 
-VOWELS = 'aeiouyéèà'
+VOWELS = 'aeiouyéèàâêîôûëïüù'
+# Débuts des mots à h aspiré (« le héros », « la hache ») : les autres mots
+# commençant par h s'élident comme devant une voyelle (« l'hôtel »)
+H_ASPIRES = ('hach', 'hai', 'haï', 'hall', 'halt', 'hamac', 'hameau',
+             'hamster', 'hanche', 'handicap', 'hangar', 'hant', 'harc',
+             'hardi', 'hareng', 'haricot', 'harpe', 'hasard', 'hât', 'hauss',
+             'haut', 'héros', 'hériss', 'hêtre', 'hibou', 'hiérarch',
+             'hockey', 'homard', 'hont', 'hors', 'hott', 'houx', 'hublot',
+             'huit', 'hurl', 'hutte')
 
 
 class Chunk:
+    __slots__ = ()
+
     def match_to_following_chunk(self, chunk: Chunk):
         return self.match_to_following_string(str(chunk))
 
@@ -50,6 +69,10 @@ class Number(Enum):
     PLURAL = auto()
 
 
+GENRES = tuple(Genre)
+NUMBERS = tuple(Number)
+
+
 class Person(Enum):
     FIRST_PERSON = 0
     SECOND_PERSON = 1
@@ -64,15 +87,31 @@ class Tense(Enum):
     INDICATIVE_IMPERFECT = auto()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Word(Chunk):
     string: str
 
+    _interned: typing.ClassVar[dict] = {}
+
     def __str__(self):
         return self.string
 
+    @classmethod
+    def intern(cls, *args):
+        '''Returns the shared instance of cls built with args, creating it
+        the first time'''
+        key = (cls, *args)
+        word = cls._interned.get(key)
+        if word is None:
+            # setdefault is atomic: threads racing to intern the same word
+            # all get the instance stored first
+            word = cls._interned.setdefault(key, cls(*args))
+        return word
+
 
 class PluralMixin:
+    __slots__ = ()
+
     als_plurals_list = ['aval', 'bal', 'banal', 'bancal', 'cal', 'carnaval',
                         'cérémonial', 'choral', 'étal', 'fatal', 'festival',
                         'natal', 'naval', 'récital', 'régal', 'tonal', 'pal',
@@ -99,9 +138,20 @@ class PluralMixin:
     def oux_plural(self):
         return self.string in self.oux_plurals_list
 
+    _plurals: typing.ClassVar[dict] = {}
+
     def plural(self) -> Word:
         '''This function takes a singular adjective or noun as input and
         returns it in plural'''
+        plural = self._plurals.get(self)
+        if plural is None:
+            forms = morphologie[self.categorie].get(self.string)
+            plural = self._plurals.setdefault(self, self.intern(
+                self._plural_string() if forms is None else forms.plural,
+                self.genre, Number.PLURAL))
+        return plural
+
+    def _plural_string(self) -> str:
         if self.string[-1] in 'szx':
             plural_string = self.string
         elif ((self.string[-2:] in ['au', 'eu'] or self.oux_plural)
@@ -113,60 +163,61 @@ class PluralMixin:
             plural_string = self.string[:-3] + 'aux'
         else:
             plural_string = self.string + 's'
-        return dataclasses.replace(self, string=plural_string,
-                                   number=Number.PLURAL)
+        return plural_string
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Noun(Word, PluralMixin):
     genre: Genre
     number: Number
 
+    # Table de morphologie où chercher les formes du mot
+    categorie: typing.ClassVar[str] = 'noms'
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Specifier(Word):
     genre: Genre
     number: Number
 
+    categorie: typing.ClassVar[str] = 'determinants'
+
     _modified_before_vowels_list = {
         'le': "l'", 'la': "l'", 'ma': 'mon ', 'sa': 'son ', 'ta': 'ton ',
         'ce': 'cet ',
     }
 
     def match_to_following_string(self, string: str) -> str:
-        if (string[0] in VOWELS
-            and self.string in self._modified_before_vowels_list):
-            return self._modified_before_vowels_list[self.string]
-        return super().match_to_following_string(string)
+        return match_with_forms(self, string)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Pronoun(Word):
     genre: Genre | None
     number: Number
     person: Person
 
     _pronoun_data: typing.ClassVar = {}
+    # (class, genre, number, person) -> pronoun
+    _index: typing.ClassVar[dict] = {}
 
     @classmethod
     def register_pronouns(cls, pronouns):
         for p in pronouns:
             cls._pronoun_data[p.string] = p
 
+    @staticmethod
+    def freeze_registries():
+        '''Makes the pronoun registries read-only once every pronoun is
+        registered, so that threads can share them'''
+        Pronoun._pronoun_data = types.MappingProxyType(Pronoun._pronoun_data)
+        Pronoun._index = types.MappingProxyType(Pronoun._index)
+
     def __new__(cls, string=None, genre=None, number=None, person=None):
         if cls is not Pronoun:
-            if not getattr(cls, '_instances', None):
-                cls._instances = []
             if string is None:
-                for instance in cls._instances:
-                    if ((instance.genre is None or instance.genre == genre)
-                        and instance.number == number and instance.person == person):
-                        return instance
-                else:
-                    raise ValueError(f"Couldn't find any pronoun matching the genre, number and person you specified")
-            obj = object.__new__(cls)
-            cls._instances.append(obj)
-            return obj
+                return cls.find(genre, number, person)
+            return object.__new__(cls)
         if string is None:
             raise TypeError("Can't create a pronoun without string in base pronoun class. Use a subclass.")
         p = cls._pronoun_data.get(string)
@@ -178,19 +229,34 @@ class Pronoun(Word):
         if getattr(self, '_init_done', False):
             # We're just getting init'ed again after having been found through Pronoun._pronouns_data
             return
-        self._init_done = True
+        if isinstance(self._index, types.MappingProxyType):
+            raise TypeError("Pronoun registries are frozen: new pronouns can't be created")
+        object.__setattr__(self, '_init_done', True)
         if not all(a is not None for a in (number, person)):
             raise TypeError("Only a pronoun's genre and string may be None")
-        self.string = string
-        self.genre = genre
-        self.number = number
-        self.person = person
+        object.__setattr__(self, 'string', string)
+        object.__setattr__(self, 'genre', genre)
+        object.__setattr__(self, 'number', number)
+        object.__setattr__(self, 'person', person)
+        # A pronoun without genre matches every genre. When several pronouns
+        # match, the first one created is kept.
+        for g in ((*Genre, None) if genre is None else (genre,)):
+            self._index.setdefault((type(self), g, number, person), self)
 
     @classmethod
-    def random(cls, genre, number, person):
+    def find(cls, genre, number, person):
+        '''Returns the pronoun of this class matching the genre, number and
+        person'''
+        try:
+            return cls._index[cls, genre, number, person]
+        except KeyError:
+            raise ValueError(f"Couldn't find any pronoun matching the genre, number and person you specified") from None
+
+    @classmethod
+    def random(cls, genre, number, person, rng=None):
         if cls is Pronoun:
-            raise
-        return cls(genre=genre, number=number, person=person)
+            raise TypeError("Can't pick a pronoun in base pronoun class. Use a subclass.")
+        return cls.find(genre, number, person)
 
 
 class SubjectPronoun(Pronoun):
@@ -208,13 +274,16 @@ SubjectPronoun.register_pronouns((
     SubjectPronoun('ils', Genre.MASCULINE, Number.PLURAL, Person.THIRD_PERSON),
     SubjectPronoun('elles', Genre.FEMININE, Number.PLURAL, Person.THIRD_PERSON),
 ))
+Pronoun.freeze_registries()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Adjective(Word, PluralMixin):
     genre: Genre
     number: Number
 
+    categorie: typing.ClassVar[str] = 'adjectifs'
+
     _modified_before_vowels_list: typing.ClassVar = {
         'beau': 'bel ', 'nouveau': 'nouvel ', 'vieux': 'vieil '
     }
@@ -225,9 +294,7 @@ class Adjective(Word, PluralMixin):
         return self.string in self._before_noun_list
 
     def match_to_following_string(self, string: str) -> str:
-        if string[0] in VOWELS and self.string in self._modified_before_vowels_list:
-            return self._modified_before_vowels_list[self.string]
-        return super().match_to_following_string(string)
+        return match_with_forms(self, string)
 
 
 @dataclass
@@ -330,9 +397,11 @@ etre_base = VerbalBase(
         Tense.PAST_PARTICIPLE: {None: 'été'},
     },
 )
+# Both auxiliaries are registered: the registry is read-only from now on
+VerbalBase._auxiliaries = types.MappingProxyType(VerbalBase._auxiliaries)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Verb(Chunk):
     base: VerbalBase
     tense: Tense
@@ -341,56 +410,76 @@ class Verb(Chunk):
     string: str = None
 
     def __post_init__(self):
-        self.string = self.base.conjugate(self.tense, self.person, self.number)
+        object.__setattr__(self, 'string', self.base.conjugate(
+            self.tense, self.person, self.number))
 
     def __str__(self):
         return self.string
 
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChunkGroup(Chunk):
-    chunks: list[Chunk]
+    chunks: tuple[Chunk, ...]
 
     def match_to_following_chunk(self, chunk=None):
-        iterator = iter(self.chunks[::-1])
-        word_list = []
-        if chunk is None:
-            prev_chunk = next(iterator)
-            word_list.append(str(prev_chunk))
-        else:
-            prev_chunk = chunk
+        if chunk is not None:
+            chunk = str(next(leaves((chunk,))))
+        return ''.join(matched_strings(self.chunks, chunk))
 
-        for word in iterator:
-            word_list.append(word.match_to_following_chunk(prev_chunk))
-            prev_chunk = word
+    def __str__(self):
+        return ''.join(matched_strings(self.chunks))
 
-        return ''.join(word_list[::-1])
+    def strings(self) -> list[str]:
+        '''Returns the words of the group as strings, each one matched to
+        the following one (e.g. "l'" before a vowel)'''
+        return [string.rstrip(' ') for string in matched_strings(self.chunks)]
 
-    def __str__(self):
-        return self.match_to_following_chunk(None)
+
+def leaves(chunks):
+    'Yields the words of chunks in order, going through nested groups'
+    for chunk in chunks:
+        if isinstance(chunk, ChunkGroup):
+            yield from leaves(chunk.chunks)
+        else:
+            yield chunk
+
+
+def matched_strings(chunks, following=None):
+    '''Yields the string of each word of chunks, matched to the first letter
+    of the word following it, in a single pass. The last word is matched to
+    following if it is given.'''
+    pending = None
+    for word in leaves(chunks):
+        if pending is not None:
+            yield pending.match_to_following_string(str(word))
+        pending = word
+    if following is None:
+        yield str(pending)
+    else:
+        yield pending.match_to_following_string(following)
 
 
 class WordGroup(ChunkGroup):
+    __slots__ = ()
+
     @property
     def words(self):
         return self.chunks
 
-    @words.setter
-    def words(self, value):
-        self.chunks = value
 
-
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NounGroup(WordGroup):
     number: Number = None
     genre: Genre = None
     specifier: Specifier = None
     noun: Noun = None
-    adjectives: list[Adjective] = None
+    adjectives: tuple[Adjective, ...] = None
 
     def __init__(self, number=None, genre=None, specifier=None, noun=None,
-                 adjectives=None):
+                 adjectives=None, rng=random):
+        '''Missing parts are drawn with rng (random.Random or the random
+        module)'''
         if adjectives is None:
             adjectives = []
         # Genre detection
@@ -400,9 +489,8 @@ class NounGroup(WordGroup):
                 if w is not None
             ), None)
             if genre is None:
-                genre = random.choice(list(Genre))
-        else:
-            self.genre = genre
+                genre = rng.choice(GENRES)
+        object.__setattr__(self, 'genre', genre)
 
         if number is None:
             number = next((
@@ -410,76 +498,177 @@ class NounGroup(WordGroup):
                 if w is not None
             ), None)
             if number is None:
-                number = random.choice(list(Number))
-        else:
-            self.number = number
+                number = rng.choice(NUMBERS)
+        object.__setattr__(self, 'number', number)
 
         if specifier is None:
-            self.specifier = Specifier(
-                random.choice(
-                    determinants[genre]) if number == Number.SINGULAR
-                    else random.choice(determinants[number]
-                ),
-                genre=genre, number=number)
-        else:
-            self.specifier = specifier
+            specifier = Specifier.intern(
+                tables_tirage['determinants', genre].choice(rng)
+                if number == Number.SINGULAR
+                else tables_tirage['determinants', number].choice(rng),
+                genre, number)
 
         if not adjectives:
-            self.adjectives = [Adjective(random.choice(adjectifs[genre]),
-                                         genre=genre, number=number)]
-        else:
-            self.adjectives = adjectives
+            adjectives = [Adjective.intern(
+                tables_tirage['adjectifs', genre].choice(rng), genre,
+                Number.SINGULAR)]
 
         if noun is None:
-            self.noun = Noun(random.choice(noms[genre]), genre=genre,
-                             number=number)
-        else:
-            self.noun = noun
+            noun = Noun.intern(tables_tirage['noms', genre].choice(rng), genre,
+                               Number.SINGULAR)
 
         if number == Number.PLURAL:
-            self.adjectives = [adj.plural() for adj in adjectives]
-            self.noun = self.noun.plural()
-
-        self.words = [
-            self.specifier,
-            *(adj for adj in self.adjectives if adj.before_noun),
-            self.noun,
-            *(adj for adj in self.adjectives if not adj.before_noun)]
+            adjectives = [adj.plural() for adj in adjectives]
+            noun = noun.plural()
+
+        # The group is frozen once built
+        object.__setattr__(self, 'specifier', specifier)
+        object.__setattr__(self, 'adjectives', tuple(adjectives))
+        object.__setattr__(self, 'noun', noun)
+        object.__setattr__(self, 'chunks', (
+            specifier,
+            *(adj for adj in adjectives if adj.before_noun),
+            noun,
+            *(adj for adj in adjectives if not adj.before_noun)))
 
     @classmethod
-    def random(cls, **kwargs):
-        return cls(number=kwargs.get('number'), genre=kwargs.get('genre'))
+    def random(cls, rng=random, **kwargs):
+        return cls(number=kwargs.get('number'), genre=kwargs.get('genre'),
+                   rng=rng)
 
 
 class FunctionWordGroup(WordGroup):
-    def __init__(self, chunk=None, **kwargs):
+    __slots__ = ()
+
+    def __init__(self, chunk=None, rng=random, **kwargs):
         if chunk is None:
-            chunk = random.choice(self.DEFAULT_CHUNK_TYPES)
+            chunk = rng.choice(self.DEFAULT_CHUNK_TYPES)
 
-        if isinstance(chunk, Chunk):
-            self.chunks = [chunk]
-        else:
+        if not isinstance(chunk, Chunk):
             if set(kwargs.keys()) != self.ARGS:
                 raise TypeError(f"Exactly the following arguments should be passed to {self.__class__}: {self.ARGS}")
-            self.chunks = [chunk.random(**kwargs)]
+            chunk = chunk.random(rng=rng, **kwargs)
+        object.__setattr__(self, 'chunks', (chunk,))
 
 
 class DirectObject(FunctionWordGroup):
+    __slots__ = ()
+
     DEFAULT_CHUNK_TYPES = (NounGroup,)
     ARGS = {'genre', 'number'}
 
 
 class Subject(FunctionWordGroup):
+    __slots__ = ()
+
     DEFAULT_CHUNK_TYPES = (NounGroup, SubjectPronoun)
     ARGS = {'genre', 'number', 'person'}
 
 
 class Sentence(ChunkGroup):
-    pass
+    __slots__ = ()
+
+
+@dataclass(frozen=True, slots=True)
+class WordForms:
+    '''Forms of a noun, adjective or determiner string, looked up in
+    morphologie[word.categorie] instead of being recomputed at each use'''
+    plural: str
+    # Rendered string before a vowel or h muet ("l'", 'bel ')
+    before_vowel: str
+
+
+def voyelle_initiale(mot):
+    '''Vrai si les mots s'élident devant mot : voyelle ou h muet'''
+    return mot[0] in VOWELS or (mot[0] == 'h'
+                                and not mot.startswith(H_ASPIRES))
+
+
+def match_with_forms(word, string):
+    '''Rendered string of word (a Specifier or Adjective) before the word
+    string, using morphologie when word is in the lexicon'''
+    if not voyelle_initiale(string):
+        return f'{word.string} '
+    forms = morphologie[word.categorie].get(word.string)
+    if forms is not None:
+        return forms.before_vowel
+    return word._modified_before_vowels_list.get(word.string,
+                                                 f'{word.string} ')
 
 
 # Données
 
+def calcule_alias(poids):
+    '''Probabilités et alias de la méthode des alias de Vose pour les poids
+    donnés, ou None si le tirage est uniforme (poids tous égaux)'''
+    poids = list(poids)
+    if not poids or min(poids) == max(poids) != 0:
+        return None
+    if min(poids) < 0:
+        raise ValueError('Les poids doivent être positifs')
+    if max(poids) == 0:
+        raise ValueError('Au moins un poids doit être non nul')
+    n = len(poids)
+    total = sum(poids)
+    echelle = [p * n / total for p in poids]
+    petits = [i for i, p in enumerate(echelle) if p < 1]
+    grands = [i for i, p in enumerate(echelle) if p >= 1]
+    probabilites = [1.0] * n
+    alias = list(range(n))
+    while petits and grands:
+        petit = petits.pop()
+        grand = grands.pop()
+        probabilites[petit] = echelle[petit]
+        alias[petit] = grand
+        echelle[grand] += echelle[petit] - 1
+        (petits if echelle[grand] < 1 else grands).append(grand)
+    return probabilites, alias
+
+
+class AliasTable:
+    '''Tirage pondéré en temps constant d'un élément de la séquence
+    elements (méthode des alias de Vose). Sans poids, ou avec des poids tous
+    égaux, le tirage est uniforme et rien n'est précalculé.'''
+    __slots__ = ('elements', 'poids', 'probabilites', 'alias')
+
+    def __init__(self, elements, poids=None):
+        self.elements = elements
+        self.poids = self.probabilites = self.alias = None
+        if poids is None:
+            return
+        poids = list(poids)
+        if len(poids) != len(elements):
+            raise ValueError('Il faut un poids par élément')
+        tables = calcule_alias(poids)
+        if tables is not None:
+            self.poids = poids
+            self.probabilites, self.alias = tables
+
+    @classmethod
+    def precalculee(cls, elements, poids, probabilites, alias):
+        '''Table dont les probabilités et alias (des séquences, par exemple
+        des colonnes d'un lexique compilé) sont déjà calculés par
+        calcule_alias'''
+        table = cls(elements)
+        table.poids = poids
+        table.probabilites = probabilites
+        table.alias = alias
+        return table
+
+    def choice(self, rng=random):
+        '''Tire un élément avec rng (random.Random ou le module
+        random)'''
+        if self.probabilites is None:
+            return rng.choice(self.elements)
+        # La partie entière choisit la colonne, la partie fractionnaire
+        # décide entre l'élément et son alias
+        u = rng.random() * len(self.probabilites)
+        i = int(u)
+        if u - i >= self.probabilites[i]:
+            i = self.alias[i]
+        return self.elements[i]
+
+
 # True : verbe transitif
 # False : verbe intransitif
 verbes = {
@@ -501,11 +690,11 @@ verbes = {
     'avoir': {'groupe': 3, 'radical': '', 'transitif': True, 'pronominal': False},
     'enclencher': {'groupe': 1, 'radical': 'enclench', 'transitif': True, 'pronominal': False},
 }
-verbes_transitifs = [k for k, v in verbes.items() if v['transitif']]
 
 temps_implementes = {'present': "Présent de l'indicatif",
                      'imparfait': "Imparfait de l'indicatif",
                      'passe_compose': 'Passé composé'}
+liste_temps = list(temps_implementes)
 
 conjug_3e = {'boire': {'indicatif': {'present': ['bois', 'bois', 'boit', 'buvons', 'buvez', 'boivent'],
                                      'imparfait': ['buvais', 'buvais', 'buvait', 'buvions', 'buviez', 'buvaient']},
@@ -546,6 +735,7 @@ adjectifs = {
                       'schtroumpf', 'sage', 'embêtant', 'faible', 'fainéant', 'grossier'],
 }
 pronoms_personnels = {'je': 0, 'tu': 1, 'il': 2, 'elle': 2, 'nous': 3, 'vous': 4, 'ils': 5, 'elles': 5}
+pronoms_sujets = list(pronoms_personnels)
 pronoms_personnels_reflechis = ['me', 'te', 'se', 'nous', 'vous', 'se']
 determinants = {Genre.MASCULINE: ['le', 'un', 'mon', 'ce', 'notre', 'votre', 'son', 'ton', 'leur', 'quelque'],
                 Genre.FEMININE: ['la', 'une', 'ma', 'cette', 'notre', 'votre', 'sa', 'ta', 'leur', 'quelque'],
@@ -554,10 +744,129 @@ adverbes = ['rapidement', 'bien', 'bruyamment', 'calmement', 'sans effort', 'sch
             'perpétuellement', 'fatalement', 'épisodiquement', 'farouchement', 'intégralement',
             'individuellement', 'anticonstitutionnellement']
 prepositions_lieu = ['à', 'sur', 'dans']
+mots_negation = ['pas', 'plus', 'jamais', 'presque plus', 'presque jamais']
 structures_phrase = [['sgn', 'v', 'adv'], ['sgn', 'v'], ['sgn', 'vt', 'cod'], ['sgn', 'vt', 'cod', 'adv'],
                      ['adv', ',', 'sgn', 'v'], ['pp', 'v'], ['pp', 'v', 'adv'], ['pp', 'vt', 'cod', 'adv'],
                      ['adv', ',', 'pp', 'vt', 'cod'], ['sgn', 'vt', 'cod', 'ccl'], ['pp', 'vt', 'cod', 'adv', 'ccl'],
                      ['adv', ',', 'sgn', 'vt', 'cod', 'ccl']]
+poids_structures = [4, 6, 6, 3, 1, 6, 3, 2, 1, 2, 1, 1]
+
+# Fréquences relatives des mots (1 pour les mots absents) : elles règlent
+# les tirages, faits avec les tables de tables_tirage
+frequences = {
+    'determinants': {'le': 20, 'la': 20, 'les': 20, 'un': 15, 'une': 15,
+                     'des': 15, 'ce': 4, 'cette': 4, 'ces': 4, 'son': 4,
+                     'sa': 4, 'ses': 4, 'mon': 3, 'ma': 3, 'mes': 3,
+                     'leur': 2, 'leurs': 2, 'notre': 2, 'nos': 2,
+                     'votre': 2, 'vos': 2, 'ton': 2, 'ta': 2, 'tes': 2},
+    'verbes': {'faire': 10, 'prendre': 6, 'parler': 4, 'manger': 3,
+               'marcher': 2, 'dormir': 2, 'courir': 2, 'boire': 2},
+    'adverbes': {'bien': 10, 'rapidement': 3, 'calmement': 2,
+                 'sans effort': 2},
+    'noms': {'mot': 3, 'voiture': 3, 'lit': 2, 'papier': 2, 'jeu': 2,
+             'verre': 2, 'discussion': 2},
+    'adjectifs': {'grand': 5, 'grande': 5, 'beau': 4, 'belle': 4,
+                  'noir': 2, 'noire': 2, 'bleu': 2, 'bleue': 2},
+}
+
+# Index des structures : chaque nature pouvant être imposée par les
+# paramètres de genere_phrase correspond à un bit
+bits_natures = {n: 1 << i for i, n in enumerate(
+    ('pp', 'sgn', 'v', 'vt', 'cod', 'adv', 'ccl'))}
+
+
+def masque_natures(natures):
+    masque = 0
+    for n in natures:
+        masque |= bits_natures.get(n, 0)
+    return masque
+
+
+def indexe_structures():
+    '''(Re)construit l'index des structures compatibles avec chaque
+    ensemble de natures imposées, représenté par son masque, et les tables
+    de tirage correspondantes'''
+    global index_structures, tables_structures
+    masques = [masque_natures(s) for s in structures_phrase]
+    index_structures = {}
+    tables_structures = {}
+    for contraintes in range(1 << len(bits_natures)):
+        compatibles = [i for i, m in enumerate(masques)
+                       if m & contraintes == contraintes]
+        index_structures[contraintes] = [structures_phrase[i]
+                                         for i in compatibles]
+        tables_structures[contraintes] = AliasTable(
+            index_structures[contraintes],
+            [poids_structures[i] for i in compatibles])
+
+
+def _poids(categorie, mots):
+    'Poids des mots, ou None si la catégorie n\'a pas de fréquences'
+    f = frequences.get(categorie)
+    if not f:
+        return None
+    return [f.get(m, 1) for m in mots]
+
+
+def construit_morphologie(noms, adjectifs, determinants):
+    '''Tables des formes (WordForms) des noms, adjectifs et déterminants du
+    lexique, au singulier et au pluriel, une par catégorie de mots (voir
+    l'attribut categorie des classes) : un nom peut s'écrire comme un
+    déterminant (« son »). Le pluriel d'un déterminant est celui de même
+    position dans determinants[Number.PLURAL].'''
+    tables = {classe.categorie: {} for classe in (Noun, Adjective, Specifier)}
+
+    def ajoute(mot, classe, pluriel):
+        table = tables[classe.categorie]
+        if mot in table:
+            return
+        table[mot] = WordForms(
+            pluriel,
+            classe._modified_before_vowels_list.get(mot, f'{mot} ')
+            if classe is not Noun else f'{mot} ')
+
+    def pluriel(mot):
+        return Noun(mot, Genre.MASCULINE, Number.SINGULAR)._plural_string()
+
+    masculins = determinants.get(Genre.MASCULINE, [])
+    feminins = determinants.get(Genre.FEMININE, [])
+    pluriels = determinants.get(Number.PLURAL, [])
+    alignes = len(masculins) == len(feminins) == len(pluriels)
+    for mot in pluriels:
+        ajoute(mot, Specifier, mot)
+    for mots in (masculins, feminins):
+        for i, mot in enumerate(mots):
+            ajoute(mot, Specifier, pluriels[i] if alignes else mot)
+
+    for classe, mots in ((Adjective, adjectifs), (Noun, noms)):
+        for liste in mots.values():
+            for mot in liste:
+                ajoute(mot, classe, pluriel(mot))
+                ajoute(pluriel(mot), classe, pluriel(mot))
+    return tables
+
+
+def indexe_lexique():
+    '''(Re)construit les listes de verbes transitifs et non auxiliaires,
+    les tables de tirage et la table morphologie'''
+    global verbes_transitifs, verbes_non_auxiliaires, tables_tirage, \
+        morphologie
+    morphologie = construit_morphologie(noms, adjectifs, determinants)
+    verbes_transitifs = [v for v, cara in verbes.items() if cara['transitif']]
+    verbes_non_auxiliaires = [v for v in verbes if v not in ('être', 'avoir')]
+
+    tables_tirage = {
+        'verbes_transitifs': AliasTable(
+            verbes_transitifs, _poids('verbes', verbes_transitifs)),
+        'verbes_non_auxiliaires': AliasTable(
+            verbes_non_auxiliaires, _poids('verbes', verbes_non_auxiliaires)),
+        'adverbes': AliasTable(adverbes, _poids('adverbes', adverbes)),
+    }
+    for categorie, mots in (('noms', noms), ('adjectifs', adjectifs),
+                            ('determinants', determinants)):
+        for classe, liste in mots.items():
+            tables_tirage[categorie, classe] = AliasTable(
+                liste, _poids(categorie, liste))
 
 
 class EmptyRootError(NameError):
@@ -572,173 +881,400 @@ def convert_conjugations(conjugations):
     }
 
 
+temps_conjugaison = {
+    'present': Tense.INDICATIVE_PRESENT,
+    'imparfait': Tense.INDICATIVE_IMPERFECT,
+    'passe_compose': Tense.INDICATIVE_COMPOUND_PAST,
+}
+
+
+def table_conjugaison(base):
+    '''Conjugue la base verbale à toutes les personnes de tous les temps
+    implémentés. Les formes sont rangées dans un tuple, dans l'ordre des
+    personnes (0 à 2 au singulier, 3 à 5 au pluriel).'''
+    return {
+        temps: tuple(
+            base.conjugate(tense, Person(i % 3),
+                           Number.PLURAL if i >= 3 else Number.SINGULAR)
+            for i in range(6))
+        for temps, tense in temps_conjugaison.items()
+    }
+
+
+def _base_verbale(infinitif, groupe, radical, transitif, pronominal,
+                  conjugaisons=None):
+    if infinitif == 'avoir':
+        return avoir_base
+    if infinitif == 'être':
+        return etre_base
+    return VerbalBase(infinitif, group=groupe, root=radical,
+                      transitive=transitif, reflexive=pronominal,
+                      conjugations=conjugaisons)
+
+
+@functools.lru_cache(maxsize=1024)
+def _table_conjugaison_cle(groupe, radical, transitif, pronominal,
+                           conjugaisons=None):
+    '''Table de conjugaison d'un verbe ne faisant pas partie du lexique.
+    conjugaisons est None ou un tuple (présent, imparfait, participe passé).'''
+    if conjugaisons is not None:
+        present, imparfait, participe = conjugaisons
+        conjugaisons = convert_conjugations({
+            'indicatif': {'present': list(present),
+                          'imparfait': list(imparfait)},
+            'participe': {'passe': participe},
+        })
+    infinitif = radical + 'ir' if groupe == 2 else radical + 'er'
+    return table_conjugaison(_base_verbale(
+        infinitif, groupe, radical, transitif, pronominal, conjugaisons))
+
+
+@functools.lru_cache(maxsize=1024)
+def _table_verbe_inconnu(verbe):
+    m = re.search(r'(.+)([ei]r)$', verbe)
+    if m is None:
+        return None
+    radical, terminaison = m.groups()
+    groupe = 1 if terminaison == 'er' else 2
+    return table_conjugaison(_base_verbale(verbe, groupe, radical, False,
+                                           False))
+
+
+def _table_verbe_dict(verbe):
+    conjugaisons = None
+    if verbe['groupe'] == 3:
+        c = verbe['conjugaisons']
+        conjugaisons = (tuple(c['indicatif']['present']),
+                        tuple(c['indicatif']['imparfait']),
+                        c['participe']['passe'])
+    return _table_conjugaison_cle(verbe['groupe'], verbe['radical'],
+                                  verbe['transitif'], verbe['pronominal'],
+                                  conjugaisons)
+
+
+def construit_tables():
+    '''(Re)construit les bases verbales et les tables de conjugaison de tous
+    les verbes du lexique'''
+    global bases_verbales, tables_conjugaison
+    bases_verbales = {
+        verbe: _base_verbale(
+            verbe, cara['groupe'], cara['radical'], cara['transitif'],
+            cara['pronominal'],
+            convert_conjugations(conjug_3e[verbe]) if cara['groupe'] == 3
+            else None)
+        for verbe, cara in verbes.items()
+    }
+    tables_conjugaison = {verbe: table_conjugaison(base)
+                          for verbe, base in bases_verbales.items()}
+
+
+# Variables enregistrées dans un instantané : le lexique et tout ce qui en
+# est dérivé
+ETAT_MOTEUR = ('verbes', 'conjug_3e', 'noms', 'adjectifs', 'determinants',
+               'adverbes', 'prepositions_lieu', 'mots_negation',
+               'structures_phrase', 'poids_structures', 'frequences',
+               'pronoms_personnels', 'index_structures', 'tables_structures',
+               'verbes_transitifs', 'verbes_non_auxiliaires', 'tables_tirage',
+               'morphologie', 'bases_verbales', 'tables_conjugaison')
+
+
+def empreinte_source(source=None):
+    '''Empreinte de ce fichier (code et lexique intégré), du fichier
+    source du lexique s'il est donné et de la version de Python : un
+    instantané n'est chargé que si elle n'a pas changé'''
+    empreinte = hashlib.sha256(sys.version.encode())
+    for chemin in (__file__, source):
+        if chemin is not None:
+            with open(chemin, 'rb') as f:
+                empreinte.update(f.read())
+    return empreinte.hexdigest()
+
+
+def sauve_instantane(chemin, source=None):
+    '''Enregistre le moteur (lexique, index, tables de conjugaison et mots
+    déjà créés), construit à partir du fichier source du lexique s'il est
+    donné, dans le fichier chemin'''
+    etat = {nom: globals()[nom] for nom in ETAT_MOTEUR}
+    temporaire = f'{chemin}.{os.getpid()}'
+    with open(temporaire, 'wb') as f:
+        pickle.dump(empreinte_source(source), f, pickle.HIGHEST_PROTOCOL)
+        pickle.dump((etat, Word._interned, PluralMixin._plurals), f,
+                    pickle.HIGHEST_PROTOCOL)
+    os.replace(temporaire, chemin)
+
+
+def charge_instantane(chemin, source=None):
+    '''Remplace le moteur par celui enregistré dans chemin. Renvoie False,
+    sans rien changer, si le fichier n'existe pas, est illisible ou a été
+    créé par une autre version de ce fichier ou du fichier source.'''
+    try:
+        with open(chemin, 'rb') as f:
+            if pickle.load(f) != empreinte_source(source):
+                return False
+            etat, mots, pluriels = pickle.load(f)
+    except Exception:
+        # Fichier tronqué ou créé avec d'autres classes : il sera réécrit
+        return False
+    globals().update(etat)
+    for cle, mot in mots.items():
+        Word._interned.setdefault(cle, mot)
+    for mot, pluriel in pluriels.items():
+        PluralMixin._plurals.setdefault(mot, pluriel)
+    return True
+
+
+def utilise_source(source):
+    '''Remplace le lexique intégré par le lexique source (chemin d'un
+    fichier JSON ou CSV, ou dictionnaire, au format de lexique.py) et
+    reconstruit les index et les tables'''
+    # Importé seulement ici : lexique importe ce module
+    import lexique
+    if not isinstance(source, dict):
+        source = lexique.lit_source(source)
+    globals().update(lexique.importe_source(source))
+    indexe_lexique()
+    construit_tables()
+
+
+# Avec TEXTE_LEXIQUE, le lexique est lu dans ce fichier source au lieu
+# d'être celui de ce fichier. Avec TEXTE_INSTANTANE en plus, le moteur est
+# chargé depuis ce fichier s'il est à jour, sinon il est construit puis
+# enregistré. Le lexique intégré est plus rapide à construire qu'à charger
+# et n'utilise pas d'instantané.
+_source = os.environ.get('TEXTE_LEXIQUE')
+_instantane = os.environ.get('TEXTE_INSTANTANE') if _source else None
+if not (_instantane and charge_instantane(_instantane, _source)):
+    indexe_structures()
+    if _source:
+        utilise_source(_source)
+    else:
+        indexe_lexique()
+        construit_tables()
+    if _instantane:
+        try:
+            sauve_instantane(_instantane, _source)
+        except OSError:
+            # Un instantané impossible à écrire ne doit pas empêcher l'import
+            pass
+
+
 def conjugaison(verbe, personne=None, temps='present', *,
                 ajouter_pronoms=True):
     '''Conjugue le verbe passé en paramètre
     au temps et à la personne voulus'''
     if personne is None and temps != 'participe_passe':
         return verbe
-    verbe_conjugue = []
     if isinstance(verbe, dict):
-        cara_verbe = verbe
-    elif verbe in verbes:
-        cara_verbe = verbes[verbe]
+        table = _table_verbe_dict(verbe)
+    elif verbe in tables_conjugaison:
+        table = tables_conjugaison[verbe]
     else:
-        m = re.search(r'(.+)([ei]r)$', verbe)
-        if m is not None:
-            radical, terminaison = m.groups()
-            groupe = 1 if terminaison == 'er' else 2
-        else:
+        table = _table_verbe_inconnu(verbe)
+        if table is None:
             return verbe
-        cara_verbe = {'groupe': groupe, 'radical': radical, 'transitif': False,
-                      'pronominal': False}
-    radical = cara_verbe['radical']
-    groupe = cara_verbe['groupe']
-    if groupe != 3:
-        conjugations = None
-    elif isinstance(verbe, dict) and 'conjugaisons' in verbe:
-        conjugations = convert_conjugations(verbe)
-    elif verbe in conjug_3e:
-        conjugations = convert_conjugations(conjug_3e[verbe])
-    tense = {
-        'present': Tense.INDICATIVE_PRESENT,
-        'imparfait': Tense.INDICATIVE_IMPERFECT,
-        'passe_compose': Tense.INDICATIVE_COMPOUND_PAST,
-    }[temps]
     if isinstance(personne, Person):
-        number = Number.SINGULAR
-        person = personne
-    elif personne >= 3:
-        number = Number.PLURAL
-        person = Person(personne - 3)
-    else:
-        number = Number.SINGULAR
-        person = Person(personne)
-
-    base = VerbalBase(
-        verbe if not isinstance(verbe, dict) else (
-            radical + 'ir' if groupe == 2 else radical + 'er'),
-        group=groupe, root=radical, transitive=cara_verbe['transitif'],
-        reflexive=cara_verbe['pronominal'], conjugations=conjugations
-    )
-    return base.conjugate(tense, person, number)
-
-    if groupe == 3:
-        if temps == 'participe_passe':
-            if isinstance(verbe, dict):
-                verbe_conjugue = verbe['conjugaisons']['participe']['temps']
-            else:
-                verbe_conjugue = conjug_3e[verbe]['participe']['passe']
-        elif temps == 'passe_compose':
-            if isinstance(verbe, dict):
-                verbe_conjugue = conjugaison('être' if verbe['pronominal'] else 'avoir', personne) + ' ' + conjugaison(verbe, 0, temps='participe_passe', ajouter_pronoms=False)
-            else:
-                verbe_conjugue = conjugaison('être' if verbes[verbe]['pronominal'] else 'avoir', personne) + ' ' + conjugaison(verbe, 0, temps='participe_passe', ajouter_pronoms=False)
-        elif isinstance(verbe, dict):
-            verbe_conjugue = verbe['conjugaisons']['indicatif'][temps][personne]
-        else:
-            verbe_conjugue = conjug_3e[verbe]['indicatif'][temps][personne]
-    elif temps == 'participe_passe':
-        return radical + conjugaisons['participe']['passe'][groupe]
-    elif temps == 'passe_compose':
-        verbe_conjugue = conjugaison('être' if verbes[verbe]['pronominal'] else 'avoir', personne) + ' ' + conjugaison(verbe, temps='participe_passe', ajouter_pronoms=False)
-    else:
-        terminaison = conjugaisons['indicatif'][temps][groupe][personne]
-        if radical == '':
-            raise EmptyRootError(verbe)
-        if groupe == 1:
-            verbe_conjugue = radical + ('e' if (terminaison[0] in ['a', 'o', 'u'] and radical[-1] == 'g') else '') + terminaison
-        elif groupe == 2:
-            verbe_conjugue = radical + terminaison
-    if ajouter_pronoms:
-        if cara_verbe['pronominal']:
-            if verbe_conjugue[0] not in VOWELS or pronoms_personnels_reflechis[personne][-1] not in VOWELS:
-                verbe_conjugue = pronoms_personnels_reflechis[personne] + ' ' + verbe_conjugue
-            else:
-                verbe_conjugue = pronoms_personnels_reflechis[personne][:-1] + "'" + verbe_conjugue
-    return verbe_conjugue
+        personne = personne.value
+    return table[temps][personne]
 
 
-def complement_lieu(prep=None, gn=None):
+def complement_lieu(prep=None, gn=None, rng=random):
     'Génère complément circonstanciel de temps'
     if prep is None:
-        prep = random.choice(prepositions_lieu)
+        prep = rng.choice(prepositions_lieu)
     if gn is None:
-        gn = noun_group()
+        gn = NounGroup(rng=rng)
+    mots = gn.strings()
     if prep == 'à':
-        if gn['contenu'][0] == 'le':
+        if mots[0] == 'le':
             prep = 'au'
-            gn['det'] = ''
-            gn['contenu'][0] = ''
-        elif gn['contenu'][0] == 'les':
+            mots = mots[1:]
+        elif mots[0] == 'les':
             prep = 'aux'
-            gn['det'] = ''
-            gn['contenu'][0] = ''
-    complement = [prep] + gn.words
+            mots = mots[1:]
+    complement = [prep] + mots
     return {'contenu': complement, 'prep': prep, 'cod': gn}
 
 
-def genere_phrase(structure=None, temps=None, question=None, negatif=None, mot_negation=None, sujet=None, verbe=None, cod=None, adv=None, ccl=None):
-    'Génère une phrase'
+def est_transitif(verbe):
+    if isinstance(verbe, dict):
+        return verbe['transitif']
+    return verbe in verbes and verbes[verbe]['transitif']
+
+
+def masque_contraintes(sujet=None, verbe=None, cod=None, adv=None,
+                       ccl=None):
+    'Masque des natures imposées par les éléments donnés'
+    contraintes = 0
+    if sujet is not None:
+        contraintes |= bits_natures['pp' if isinstance(sujet, str) else 'sgn']
+    if verbe is not None:
+        contraintes |= bits_natures['vt' if est_transitif(verbe) else 'v']
+    if cod is not None:
+        contraintes |= bits_natures['cod']
+    if adv is not None:
+        contraintes |= bits_natures['adv']
+    if ccl is not None:
+        contraintes |= bits_natures['ccl']
+    return contraintes
+
+
+def structures_compatibles(sujet=None, verbe=None, cod=None, adv=None,
+                           ccl=None):
+    'Renvoie les structures de phrase pouvant contenir les éléments imposés'
+    return index_structures[masque_contraintes(sujet, verbe, cod, adv, ccl)]
+
+
+class Instrumentation:
+    '''Mesure la durée (et, avec allocations=True, la mémoire allouée avec
+    tracemalloc) de chaque étape de genere_phrase et de finalise_phrase.
+
+    S'utilise comme gestionnaire de contexte :
+
+        with Instrumentation() as mesures:
+            for _ in range(1000):
+                finalise_phrase(genere_phrase()['contenu'])
+        print(mesures.rapport())
+
+    ou en définissant la variable d'environnement TEXTE_MESURES (à
+    « allocations » pour suivre aussi la mémoire) : le rapport est alors
+    affiché sur la sortie d'erreur à la fin du programme.'''
+
+    def __init__(self, allocations=False):
+        self.allocations = allocations
+        self.durees = {}
+        self.memoire = {}
+        self.appels = {}
+        self._precedente = None
+        self._tracemalloc_demarre = False
+
+    def __enter__(self):
+        global _instrumentation
+        self._precedente = _instrumentation
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc_demarre = True
+        _instrumentation = self
+        return self
+
+    def __exit__(self, *exc):
+        global _instrumentation
+        _instrumentation = self._precedente
+        if self._tracemalloc_demarre:
+            tracemalloc.stop()
+            self._tracemalloc_demarre = False
+
+    def debut(self):
+        'Point de départ de la prochaine étape'
+        if self.allocations:
+            return time.perf_counter(), tracemalloc.get_traced_memory()[0]
+        return time.perf_counter(), 0
+
+    def etape(self, nom, debut):
+        '''Enregistre l'étape nom commencée à debut et renvoie le point de
+        départ de l'étape suivante'''
+        fin = self.debut()
+        self.durees[nom] = self.durees.get(nom, 0) + fin[0] - debut[0]
+        self.memoire[nom] = self.memoire.get(nom, 0) + fin[1] - debut[1]
+        self.appels[nom] = self.appels.get(nom, 0) + 1
+        return fin
+
+    def rapport(self):
+        'Tableau des mesures cumulées par étape'
+        total = sum(self.durees.values()) or 1
+        colonnes = f'{"étape":<20}{"appels":>10}{"total (ms)":>12}{"moyenne (µs)":>14}{"part":>8}'
+        if self.allocations:
+            colonnes += f'{"mémoire (o/appel)":>19}'
+        lignes = [colonnes, '-' * len(colonnes)]
+        for nom, duree in self.durees.items():
+            appels = self.appels[nom]
+            ligne = (f'{nom:<20}{appels:>10}{duree * 1e3:>12.2f}'
+                     f'{duree / appels * 1e6:>14.2f}{duree / total:>8.1%}')
+            if self.allocations:
+                ligne += f'{self.memoire[nom] / appels:>19.1f}'
+            lignes.append(ligne)
+        return '\n'.join(lignes)
+
+
+# Instrumentation active, None quand les mesures sont désactivées
+_instrumentation = None
+if os.environ.get('TEXTE_MESURES'):
+    _instrumentation = Instrumentation(
+        allocations=os.environ['TEXTE_MESURES'] == 'allocations')
+    _instrumentation.__enter__()
+    atexit.register(lambda mesures: print(mesures.rapport(), file=sys.stderr),
+                    _instrumentation)
+
+
+def structure_question(structure):
+    'Structure de la forme interrogative de la phrase de structure donnée'
+    transitif = 'vt' in structure
+    if 'pp' in structure:
+        if transitif:
+            nouvelle_structure = ['vt', '-', 'pp']
+        else:
+            nouvelle_structure = ['v', '-', 'pp']
+    elif transitif:
+        nouvelle_structure = ['Est-ce que', 'sgn', 'vt']
+    else:
+        nouvelle_structure = ['Est-ce que', 'sgn', 'v']
+    for c in ['cod', 'adv', 'ccl']:
+        if c in structure:
+            nouvelle_structure.append(c)
+    nouvelle_structure.append('?')
+    return nouvelle_structure
+
+
+def genere_phrase(structure=None, temps=None, question=None, negatif=None, mot_negation=None, sujet=None, verbe=None, cod=None, adv=None, ccl=None,
+                  min_len=None, max_len=None, unite='caracteres', rng=random):
+    '''Génère une phrase. Avec min_len et/ou max_len, la phrase finalisée
+    mesure entre min_len et max_len caractères (ou mots, avec
+    unite='mots') : voir le module longueurs. Tous les tirages sont faits
+    avec rng (random.Random ou le module random, voir Generator).'''
+    if min_len is not None or max_len is not None:
+        # Importé seulement ici : la page web n'en a pas besoin
+        import longueurs
+        return genere_phrase(rng=rng, **longueurs.plan(
+            min_len, max_len, unite, structure=structure, temps=temps,
+            question=question, negatif=negatif, mot_negation=mot_negation,
+            sujet=sujet, verbe=verbe, cod=cod, adv=adv,
+            ccl=ccl).arguments(rng))
+    mesures = _instrumentation
+    if mesures is not None:
+        debut = mesures.debut()
     phrase = []
     pas_de_structure = all(var is None for var in (structure, sujet, verbe, cod,
                                                    adv, ccl))
     if pas_de_structure:
-        structure_phrase = random.choice(structures_phrase)
+        structure_phrase = tables_structures[0].choice(rng)
     elif structure is not None:
         structure_phrase = structure
     else:
-        contenu_min = set()
-        if sujet is not None:
-            if isinstance(sujet, str):
-                contenu_min.add('pp')
-            else:
-                contenu_min.add('sgn')
-        if verbe is not None:
-            if verbe in verbes_transitifs:
-                contenu_min.add('vt')
-            else:
-                contenu_min.add('v')
-        if cod is not None:
-            contenu_min.add('cod')
-        if adv is not None:
-            contenu_min.add('adv')
-        if ccl is not None:
-            contenu_min.add('ccl')
-        structures_possibles = [s for s in structures_phrase if contenu_min.issubset(set(s))]
-        structure_phrase = random.choice(structures_possibles)
+        structure_phrase = tables_structures[
+            masque_contraintes(sujet, verbe, cod, adv, ccl)].choice(rng)
 
     transitif = 'vt' in structure_phrase
+    if mesures is not None:
+        debut = mesures.etape('structure', debut)
 
     if temps is None:
-        temps = random.choice(list(temps_implementes.keys()))
+        temps = rng.choice(liste_temps)
     if question is None:
-        question = random.choice([False, False, True])
+        question = rng.choice([False, False, True])
     if question:
-        if 'pp' in structure_phrase:
-            if transitif:
-                nouvelle_structure = ['vt', '-', 'pp']
-            else:
-                nouvelle_structure = ['v', '-', 'pp']
-        elif transitif:
-            nouvelle_structure = ['Est-ce que', 'sgn', 'vt']
-        else:
-            nouvelle_structure = ['Est-ce que', 'sgn', 'v']
-        for c in ['cod', 'adv', 'ccl']:
-            if c in structure_phrase:
-                nouvelle_structure.append(c)
-        nouvelle_structure.append('?')
-        structure_phrase = nouvelle_structure
+        structure_phrase = structure_question(structure_phrase)
     if negatif is None and mot_negation is None:
-        negatif = random.choice([False, True])
+        negatif = rng.choice([False, True])
     elif mot_negation is not None and negatif:
         negatif = True
     if negatif and mot_negation is None:
-        mot_negation = random.choice(['pas', 'plus', 'jamais', 'presque plus', 'presque jamais'])
+        mot_negation = rng.choice(mots_negation)
+    if mesures is not None:
+        debut = mesures.etape('question_negation', debut)
 
     if verbe is None:
-        verbe_infinitif = (random.choice([v for v in verbes if v not in ('être', 'avoir')]) if 'v' in structure_phrase
-                           else random.choice(verbes_transitifs))
+        verbe_infinitif = (tables_tirage['verbes_non_auxiliaires'].choice(rng)
+                           if 'v' in structure_phrase
+                           else tables_tirage['verbes_transitifs'].choice(rng))
     else:
         verbe_infinitif = verbe
         if not isinstance(verbe, dict) and verbe not in verbes:
@@ -747,59 +1283,67 @@ Il est possible de passer un dictionnaire en paramètre avec les champs \
 infinitif (str), groupe (int), radical (str), transitif (bool) et pronominal (bool) et aussi, \
 si le verbe est du troisième groupe, conjugaisons (list).""")
             return None
+    if mesures is not None:
+        debut = mesures.etape('choix_verbe', debut)
 
-    nature_sujet = 'pp' if 'pp' in structures_phrase else 'gn'
+    nature_sujet = 'pp' if 'pp' in structure_phrase else 'gn'
 
     # Définition de la personne
     if sujet is None:
         if nature_sujet == 'pp':
-            sujet = random.choice(list(pronoms_personnels.keys()))
+            sujet = rng.choice(pronoms_sujets)
             personne = pronoms_personnels[sujet]
         else:
-            sujet = NounGroup()
-            personne = Person.THIRD_PERSON
+            sujet = NounGroup(rng=rng)
+            personne = 2 if sujet.number == Number.SINGULAR else 5
     elif isinstance(sujet, str):
         personne = pronoms_personnels[sujet]
     else:
-        personne = 2 if sujet['nombre'] == 's' else 5
+        personne = 2 if sujet.number == Number.SINGULAR else 5
+    if mesures is not None:
+        debut = mesures.etape('sujet', debut)
 
     verbe = conjugaison(verbe_infinitif, personne, temps)
+    if mesures is not None:
+        debut = mesures.etape('conjugaison', debut)
 
     for nature in structure_phrase:
         if nature == 'pp':
             pp = sujet
-            if pp == 'je' and verbe[0] in VOWELS and not negatif:
+            # Pas d'élision quand le sujet est inversé (« ai-je »)
+            if (pp == 'je' and voyelle_initiale(verbe) and not negatif
+                    and not question):
                 pp = "j'"
             phrase.append(pp)
             if question and negatif:
                 phrase.append(mot_negation)
         elif nature == 'sgn':
             gn = sujet
-            phrase.extend(gn['contenu'])
+            phrase.extend(gn.strings())
         elif nature == 'cod':
             if cod is None:
-                gn = noun_group()
+                gn = NounGroup(rng=rng)
                 cod = gn
             else:
                 gn = cod
-            phrase.extend(gn['contenu'])
+            phrase.extend(gn.strings())
         elif nature in ('v', 'vt'):
             if negatif:
-                if verbe[0] not in VOWELS:
+                if not voyelle_initiale(verbe):
                     phrase.append('ne')
                 else:
                     phrase.append("n'")
                 phrase.append(verbe)
-                # if not question:
-                #     phrase.append(mot_negation)
-                phrase.append(mot_negation)
+                # With an inversion, the negation word comes after the pronoun
+                if not (question and nature_sujet == 'pp'):
+                    phrase.append(mot_negation)
             else:
                 phrase.append(verbe)
         elif nature == 'adv':
-            adv = random.choice(adverbes) if adv is None else adv
+            adv = tables_tirage['adverbes'].choice(rng) if adv is None else adv
             phrase.append(adv)
         elif nature == 'ccl':
-            ccl = complement_lieu() if ccl is None else ccl
+            ccl = complement_lieu(rng=rng) if ccl is None else ccl
             phrase.extend(ccl['contenu'])
         elif nature == ',':
             phrase.append(',')
@@ -815,6 +1359,8 @@ si le verbe est du troisième groupe, conjugaisons (list).""")
                 phrase.append('-')
         elif nature == 'Est-ce que':
             phrase.append('Est-ce que')
+    if mesures is not None:
+        mesures.etape('assemblage', debut)
 
     return {'contenu': phrase,
             'structure': structure_phrase,
@@ -830,15 +1376,174 @@ si le verbe est du troisième groupe, conjugaisons (list).""")
 
 
 def finalise_phrase(phrase):
+    '''Rend la phrase, donnée sous forme de liste de mots ou d'arbre de
+    Chunk (Sentence) : l'arbre n'est parcouru qu'une fois'''
+    mesures = _instrumentation
+    if mesures is not None:
+        debut = mesures.debut()
+    if isinstance(phrase, ChunkGroup):
+        phrase = phrase.strings()
     if phrase[-1] == '?':
-        return ' '.join(phrase).replace(' , ', ', ').replace("' ", "'").capitalize().replace(' - ', '-').replace(' -t- ', '-t-')
+        rendu = ' '.join(phrase).replace(' , ', ', ').replace("' ", "'").capitalize().replace(' - ', '-').replace(' -t- ', '-t-')
+    else:
+        rendu = (' '.join(phrase).replace(' , ', ', ').replace("' ", "'") + '.').capitalize()
+    if mesures is not None:
+        mesures.etape('rendu', debut)
+    return rendu
+
+
+def utilise_lexique(lexique):
+    '''Remplace le lexique intégré par celui passé en paramètre, qui doit
+    avoir les attributs noms, adjectifs, determinants, adverbes, verbes,
+    verbes_transitifs, verbes_non_auxiliaires, tables_conjugaison,
+    tables_tirage et morphologie (voir lexique.Lexique)'''
+    global noms, adjectifs, determinants, adverbes, verbes, \
+        verbes_transitifs, verbes_non_auxiliaires, tables_conjugaison, \
+        tables_tirage, morphologie
+    noms = lexique.noms
+    adjectifs = lexique.adjectifs
+    determinants = lexique.determinants
+    adverbes = lexique.adverbes
+    verbes = lexique.verbes
+    verbes_transitifs = lexique.verbes_transitifs
+    verbes_non_auxiliaires = lexique.verbes_non_auxiliaires
+    tables_conjugaison = lexique.tables_conjugaison
+    tables_tirage = lexique.tables_tirage
+    morphologie = lexique.morphologie
+
+
+def genere_phrases(n=None, seed=None, finalise=True, filtre=None,
+                   max_rejets=1000, min_len=None, max_len=None,
+                   unite='caracteres', rng=None, statistiques=None,
+                   **contraintes):
+    '''Génère n phrases (ou une infinité si n est None) avec les mêmes
+    contraintes que genere_phrase. Les structures compatibles avec les
+    contraintes (ou, avec min_len et max_len, les phrases possibles de la
+    bonne longueur) ne sont calculées qu'une fois pour tout le lot.
+
+    Avec un filtre (par exemple unicite.BloomFilter), seules les phrases
+    que filtre.ajoute() accepte comme nouvelles sont renvoyées ; la
+    génération s'arrête avant n phrases après max_rejets rejets consécutifs,
+    quand presque toutes les phrases possibles ont déjà été produites.
+
+    Les tirages sont faits avec rng, ou avec random.Random(seed) si seed est
+    donné, sinon avec le module random.
+
+    Chaque phrase renvoyée est ajoutée à statistiques (par exemple
+    statistiques.CorpusStatistics) avec statistiques.ajoute(resultat de
+    genere_phrase, texte finalisé ou None).'''
+    if rng is None:
+        rng = random if seed is None else random.Random(seed)
+    verbe = contraintes.get('verbe')
+    if (verbe is not None and not isinstance(verbe, dict)
+            and verbe not in verbes):
+        raise ValueError(f'Verbe inconnu : {verbe}')
+    if min_len is not None or max_len is not None:
+        import longueurs
+        plan = longueurs.plan(min_len, max_len, unite, **contraintes)
+
+        def arguments():
+            return plan.arguments(rng)
     else:
-        return (' '.join(phrase).replace(' , ', ', ').replace("' ", "'") + '.').capitalize()
+        structure = contraintes.pop('structure', None)
+        if structure is None:
+            structures = tables_structures[masque_contraintes(
+                contraintes.get('sujet'), verbe, contraintes.get('cod'),
+                contraintes.get('adv'), contraintes.get('ccl'))]
+        else:
+            structures = AliasTable([structure])
+
+        def arguments():
+            return dict(contraintes, structure=structures.choice(rng))
+
+    compteur = itertools.count() if n is None else range(n)
+    for _ in compteur:
+        for _ in range(max_rejets if filtre is not None else 1):
+            resultat = genere_phrase(rng=rng, **arguments())
+            phrase = resultat['contenu']
+            if finalise:
+                phrase = finalise_phrase(phrase)
+            if filtre is None or filtre.ajoute(
+                    phrase if finalise else finalise_phrase(phrase)):
+                break
+        else:
+            return
+        if statistiques is not None:
+            statistiques.ajoute(resultat, phrase if finalise else None)
+        yield phrase
+
+
+def genere_lot(n=100, seed=None):
+    '''Renvoie n phrases finalisées. C'est le point d'entrée de la page web,
+    qui importe le module une fois puis appelle cette fonction à chaque
+    clic.'''
+    return list(genere_phrases(n, seed=seed))
+
+
+def phrase_de_graine(graine, finalise=True, **contraintes):
+    '''Phrase entièrement déterminée par graine (un entier de 64 bits), les
+    contraintes et le lexique : il suffit de garder la graine pour
+    retrouver la phrase'''
+    phrase = genere_phrase(rng=random.Random(graine), **contraintes)
+    return finalise_phrase(phrase['contenu']) if finalise else phrase
+
+
+def genere_lot_threads(n=100, threads=None, seed=None, taille_bloc=64,
+                       **contraintes):
+    '''Renvoie n phrases finalisées générées par un pool de threads. Le lot
+    est découpé en blocs de taille_bloc phrases, chacun généré par une
+    session (Generator) dont la graine est tirée de random.Random(seed) : les
+    phrases ne dépendent ni du nombre de threads ni de leur ordre
+    d'exécution. Les threads ne travaillent en parallèle que sur un CPython
+    sans GIL (3.13t et suivants).'''
+    # Importé seulement ici : la page web n'a pas de threads
+    from concurrent.futures import ThreadPoolExecutor
+    graines = random.Random(seed)
+    blocs = [(graines.getrandbits(64), min(taille_bloc, n - debut))
+             for debut in range(0, n, taille_bloc)]
+
+    def genere_bloc(bloc):
+        graine, taille = bloc
+        return list(Generator(graine).genere_phrases(taille, **contraintes))
+
+    with ThreadPoolExecutor(threads) as executor:
+        return [phrase for lot in executor.map(genere_bloc, blocs)
+                for phrase in lot]
+
+
+class Generator:
+    '''Session de génération avec son propre random.Random : les tirages
+    d'une session ne dépendent ni du module random ni des autres sessions,
+    et une session créée avec la même graine donne les mêmes phrases.'''
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def genere_phrase(self, **contraintes):
+        'Voir genere_phrase'
+        return genere_phrase(rng=self.rng, **contraintes)
+
+    def genere_phrases(self, n=None, **options):
+        'Voir genere_phrases'
+        return genere_phrases(n, rng=self.rng, **options)
+
+    def genere_lot(self, n=100):
+        return list(self.genere_phrases(n))
+
+    def graine(self):
+        'Tire une graine de phrase de 64 bits'
+        return self.rng.getrandbits(64)
+
+    def phrases_graines(self, n=None, finalise=True, **contraintes):
+        '''Génère n couples (graine, phrase) (une infinité si n est None),
+        où phrase est phrase_de_graine(graine)'''
+        compteur = itertools.count() if n is None else range(n)
+        for _ in compteur:
+            graine = self.graine()
+            yield graine, phrase_de_graine(graine, finalise, **contraintes)
 
 
 phrases = []
 if __name__ == '__main__':
-    for _ in range(0, 100):
-        phrase = genere_phrase()['contenu']
-        phrases.append(finalise_phrase(phrase))
-        print(phrases[-1])
+    phrases = genere_lot(100)
+    print('\n'.join(phrases))
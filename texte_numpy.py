@@ -0,0 +1,310 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+'''Génération de phrases par lots avec NumPy.
+
+Tous les tirages aléatoires d'un lot (structure, temps, question, négation,
+verbe, pronom, déterminants, adjectifs, noms, adverbes, prépositions) sont
+faits en une fois sous forme de tableaux d'indices, puis les phrases sont
+assemblées à partir de formes précalculées. Les phrases suivent la même
+distribution que celles de texte.genere_phrase().'''
+
+import numpy as np
+
+import texte
+from texte import (Adjective, Genre, Noun, Number, Specifier, VOWELS,
+                   finalise_phrase, structure_question)
+
+
+# Natures des éléments d'une structure, encodées en entiers
+PP, SGN, V, VT, COD, ADV, CCL, VIRGULE, POINT_INTERROGATION, TIRET, \
+    EST_CE_QUE = range(11)
+NATURES = {'pp': PP, 'sgn': SGN, 'v': V, 'vt': VT, 'cod': COD, 'adv': ADV,
+           'ccl': CCL, ',': VIRGULE, '?': POINT_INTERROGATION, '-': TIRET,
+           'Est-ce que': EST_CE_QUE}
+
+MOTS_NEGATION = texte.mots_negation
+# Nombre de groupes nominaux tirés par phrase : sujet, cod et ccl
+GROUPES_NOMINAUX = 3
+
+
+class BatchSampler:
+    '''Encode le lexique de texte en tableaux et génère des phrases par
+    lots. Le lexique est lu à la construction : il faut créer un nouvel
+    échantillonneur si le lexique de texte change.'''
+
+    def __init__(self):
+        self.structures = [
+            tuple(NATURES[n] for n in s) for s in texte.structures_phrase]
+        self.questions = [
+            tuple(NATURES[n] for n in structure_question(s))
+            for s in texte.structures_phrase]
+        self.structure_intransitive = np.array(
+            ['v' in s for s in texte.structures_phrase])
+        self.structure_pp = np.array(
+            ['pp' in s for s in texte.structures_phrase])
+        self.cumul_structures = np.cumsum(texte.poids_structures)
+
+        self.temps = list(texte.temps_implementes)
+        self.pronoms = list(texte.pronoms_personnels)
+        self.personnes_pronoms = np.array(
+            [texte.pronoms_personnels[p] for p in self.pronoms])
+
+        # Verbes : d'abord les non auxiliaires, puis les transitifs
+        self.verbes = (list(texte.verbes_non_auxiliaires)
+                       + list(texte.verbes_transitifs))
+        self.cumul_verbes = self._cumul(
+            texte.tables_tirage[c]
+            for c in ('verbes_non_auxiliaires', 'verbes_transitifs'))
+        self.nb_verbes_intransitifs = len(texte.verbes_non_auxiliaires)
+        self.nb_verbes_transitifs = len(texte.verbes_transitifs)
+
+        genres = list(Genre)
+        self.genres = genres
+        self.nombres = list(Number)
+        # Indice de chaque genre dans les tableaux de noms et d'adjectifs
+        self.debut_noms, self.nb_noms = self._bornes(
+            [texte.noms[g] for g in genres])
+        self.debut_adjectifs, self.nb_adjectifs = self._bornes(
+            [texte.adjectifs[g] for g in genres])
+        # Déterminants : un bloc par genre au singulier, puis le pluriel
+        classes_determinants = [*genres, Number.PLURAL]
+        self.debut_determinants, self.nb_determinants = self._bornes(
+            [texte.determinants[c] for c in classes_determinants])
+        self.cumul_noms, self.cumul_adjectifs, self.cumul_determinants = (
+            self._cumul(texte.tables_tirage[categorie, c] for c in classes)
+            for categorie, classes in (('noms', genres),
+                                       ('adjectifs', genres),
+                                       ('determinants', classes_determinants)))
+
+        self.noms = self._formes(Noun, texte.noms)
+        self.adjectifs = self._formes(Adjective, texte.adjectifs)
+        self.adjectifs_avant_nom = [
+            [Adjective(a, genre=g, number=Number.SINGULAR).before_noun
+             for g in genres for a in texte.adjectifs[g]],
+            [Adjective(a, genre=g, number=Number.SINGULAR).plural().before_noun
+             for g in genres for a in texte.adjectifs[g]],
+        ]
+        # Mots devant lesquels on élide (voyelle ou h muet)
+        self.noms_voyelle, self.adjectifs_voyelle = (
+            [[texte.voyelle_initiale(m) for m in formes] for formes in mots]
+            for mots in (self.noms, self.adjectifs))
+        self.adjectifs_elides = [
+            [self._elision(Adjective(a, genre=None, number=None))
+             for a in formes]
+            for formes in self.adjectifs
+        ]
+        determinants = [d for c in classes_determinants
+                        for d in texte.determinants[c]]
+        self.determinants = determinants
+        self.determinants_elides = [
+            self._elision(Specifier(d, genre=None, number=None))
+            for d in determinants]
+
+        self.adverbes = list(texte.adverbes)
+        self.cumul_adverbes = self._cumul([texte.tables_tirage['adverbes']])
+        self.prepositions = list(texte.prepositions_lieu)
+
+    @staticmethod
+    def _bornes(listes):
+        longueurs = np.array([len(liste) for liste in listes])
+        debuts = np.concatenate(([0], np.cumsum(longueurs)[:-1]))
+        return debuts, longueurs
+
+    def _formes(self, classe, mots):
+        'Formes au singulier et au pluriel, dans l\'ordre des genres'
+        singulier = [m for g in self.genres for m in mots[g]]
+        pluriel = [
+            classe(m, genre=g, number=Number.SINGULAR).plural().string
+            for g in self.genres for m in mots[g]]
+        return [singulier, pluriel]
+
+    @staticmethod
+    def _elision(mot):
+        'Forme du mot devant une voyelle'
+        return mot.match_to_following_string(VOWELS[0]).rstrip(' ')
+
+    @staticmethod
+    def _cumul(tables):
+        '''Somme cumulée des poids des tables de tirage de texte, mises bout
+        à bout'''
+        return np.cumsum([p for table in tables
+                          for p in (table.poids if table.poids is not None
+                                    else [1] * len(table.elements))])
+
+    @staticmethod
+    def _indices(rng, n, debuts, longueurs, cumul):
+        '''Tire un indice dans le bloc debuts:debuts+longueurs, selon les
+        poids dont cumul est la somme cumulée (les mêmes que ceux des tables
+        de tirage de texte)'''
+        avant = np.where(debuts > 0, cumul[debuts - 1], 0)
+        total = cumul[debuts + longueurs - 1] - avant
+        return np.searchsorted(cumul, avant + rng.random(n) * total,
+                               side='right')
+
+    def sample(self, n, rng):
+        '''Tire les éléments de n phrases. Renvoie un dictionnaire de
+        tableaux d'indices de longueur n (ou (GROUPES_NOMINAUX, n) pour les
+        groupes nominaux).'''
+        structure = self._indices(rng, n, 0, len(self.structures),
+                                  self.cumul_structures)
+        intransitive = self.structure_intransitive[structure]
+        verbe = self._indices(
+            rng, n,
+            np.where(intransitive, 0, self.nb_verbes_intransitifs),
+            np.where(intransitive, self.nb_verbes_intransitifs,
+                     self.nb_verbes_transitifs), self.cumul_verbes)
+
+        forme = (GROUPES_NOMINAUX, n)
+        genre = rng.integers(len(self.genres), size=forme)
+        pluriel = rng.integers(2, size=forme).astype(bool)
+        classe_determinant = np.where(pluriel, len(self.genres), genre)
+        tirages = {
+            'structure': structure,
+            'temps': rng.integers(len(self.temps), size=n),
+            'question': rng.integers(3, size=n) == 2,
+            'negatif': rng.integers(2, size=n).astype(bool),
+            'mot_negation': rng.integers(len(MOTS_NEGATION), size=n),
+            'verbe': verbe,
+            'pronom': rng.integers(len(self.pronoms), size=n),
+            'adverbe': self._indices(rng, n, 0, len(self.adverbes),
+                                     self.cumul_adverbes),
+            'preposition': rng.integers(len(self.prepositions), size=n),
+            'pluriel': pluriel,
+            'determinant': self._indices(
+                rng, forme, self.debut_determinants[classe_determinant],
+                self.nb_determinants[classe_determinant],
+                self.cumul_determinants),
+            'adjectif': self._indices(rng, forme, self.debut_adjectifs[genre],
+                                      self.nb_adjectifs[genre],
+                                      self.cumul_adjectifs),
+            'nom': self._indices(rng, forme, self.debut_noms[genre],
+                                 self.nb_noms[genre], self.cumul_noms),
+        }
+        return tirages
+
+    def _groupe_nominal(self, pluriel, determinant, adjectif, nom):
+        nombre = 1 if pluriel else 0
+        nom_voyelle = self.noms_voyelle[nombre][nom]
+        nom = self.noms[nombre][nom]
+        adj = self.adjectifs[nombre][adjectif]
+        if self.adjectifs_avant_nom[nombre][adjectif]:
+            det = (self.determinants_elides[determinant]
+                   if self.adjectifs_voyelle[nombre][adjectif]
+                   else self.determinants[determinant])
+            if nom_voyelle:
+                adj = self.adjectifs_elides[nombre][adjectif]
+            return [det, adj, nom]
+        det = (self.determinants_elides[determinant] if nom_voyelle
+               else self.determinants[determinant])
+        return [det, nom, adj]
+
+    def assemble(self, tirages):
+        'Assemble les phrases tirées par sample(), sous forme de listes de mots'
+        colonnes = [tirages[c].tolist() for c in (
+            'structure', 'temps', 'question', 'negatif', 'mot_negation',
+            'verbe', 'pronom', 'adverbe', 'preposition')]
+        groupes = [[tirages[c][i].tolist() for c in (
+            'pluriel', 'determinant', 'adjectif', 'nom')]
+            for i in range(GROUPES_NOMINAUX)]
+        structures_pp = self.structure_pp.tolist()
+        personnes_pronoms = self.personnes_pronoms.tolist()
+
+        for i, (s, temps, question, negatif, mot, verbe, pronom, adverbe,
+                preposition) in enumerate(zip(*colonnes)):
+            structure = self.questions[s] if question else self.structures[s]
+            mot = MOTS_NEGATION[mot] if negatif else None
+            if structures_pp[s]:
+                sujet = self.pronoms[pronom]
+                personne = personnes_pronoms[pronom]
+            else:
+                sujet = None
+                personne = 5 if groupes[0][0][i] else 2
+            infinitif = self.verbes[verbe]
+            verbe = texte.tables_conjugaison[infinitif][
+                self.temps[temps]][personne]
+
+            phrase = []
+            for nature in structure:
+                if nature == PP:
+                    if (sujet == 'je' and texte.voyelle_initiale(verbe)
+                            and not negatif and not question):
+                        phrase.append("j'")
+                    else:
+                        phrase.append(sujet)
+                    if question and negatif:
+                        phrase.append(mot)
+                elif nature in (SGN, COD):
+                    g = groupes[0 if nature == SGN else 1]
+                    phrase.extend(self._groupe_nominal(
+                        g[0][i], g[1][i], g[2][i], g[3][i]))
+                elif nature in (V, VT):
+                    if negatif:
+                        phrase.append("n'" if texte.voyelle_initiale(verbe)
+                                      else 'ne')
+                        phrase.append(verbe)
+                        if not (question and sujet is not None):
+                            phrase.append(mot)
+                    else:
+                        phrase.append(verbe)
+                elif nature == ADV:
+                    phrase.append(self.adverbes[adverbe])
+                elif nature == CCL:
+                    g = groupes[2]
+                    mots = self._groupe_nominal(g[0][i], g[1][i], g[2][i],
+                                                g[3][i])
+                    prep = self.prepositions[preposition]
+                    if prep == 'à':
+                        if mots[0] == 'le':
+                            prep = 'au'
+                            del mots[0]
+                        elif mots[0] == 'les':
+                            prep = 'aux'
+                            del mots[0]
+                    phrase.append(prep)
+                    phrase.extend(mots)
+                elif nature == VIRGULE:
+                    phrase.append(',')
+                elif nature == POINT_INTERROGATION:
+                    phrase.append('?')
+                elif nature == TIRET:
+                    if sujet[0] in VOWELS and verbe[-1] not in 'dt':
+                        phrase.append('-t-')
+                    else:
+                        phrase.append('-')
+                elif nature == EST_CE_QUE:
+                    phrase.append('Est-ce que')
+            yield phrase
+
+
+_sampler = None
+
+
+def genere_phrases(n, seed=None, finalise=True):
+    '''Génère n phrases avec un échantillonneur vectorisé. seed initialise
+    le générateur NumPy (numpy.random.default_rng).'''
+    global _sampler
+    if _sampler is None:
+        _sampler = BatchSampler()
+    rng = np.random.default_rng(seed)
+    phrases = _sampler.assemble(_sampler.sample(n, rng))
+    if finalise:
+        return [finalise_phrase(phrase) for phrase in phrases]
+    return list(phrases)
@@ -0,0 +1,195 @@
+#! /usr/bin/env python3
+#
+# Génération de texte
+# Copyright (C) 2019 Ewenak@github
+#
+# Génération de texte is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Génération de texte is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Génération de texte; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+
+'''Filtre de Bloom pour générer des phrases toutes différentes sans garder
+en mémoire l'ensemble des phrases déjà produites :
+
+    filtre = BloomFilter(1000000, taux_faux_positifs=0.001)
+    phrases = list(texte.genere_phrases(1000000, filtre=filtre))
+    print(filtre.taux_rejet, filtre.remplissage)
+
+Un faux positif fait rejeter une phrase nouvelle, mais une phrase n'est
+jamais renvoyée deux fois. Quand le taux de rejet approche 1, presque
+toutes les phrases possibles ont déjà été produites.
+
+Partition répartit les phrases entre plusieurs processus selon leur
+empreinte : chacun ne garde que celles de sa partie, et deux processus ne
+produisent donc jamais la même phrase.
+
+HyperLogLog estime le nombre de phrases différentes d'un flux, avec une
+erreur relative d'environ 1,04 / √(2 ** precision) et une mémoire fixe de
+2 ** precision octets.'''
+
+import hashlib
+import math
+import zlib
+
+
+class BloomFilter:
+    '''Filtre de Bloom dimensionné pour capacite éléments avec le taux de
+    faux positifs demandé. Avec octets, la taille est limitée à ce nombre
+    d'octets : le taux de faux positifs réel est alors plus élevé (voir
+    taux_faux_positifs_estime).'''
+
+    def __init__(self, capacite, taux_faux_positifs=0.001, octets=None):
+        if capacite <= 0 or not 0 < taux_faux_positifs < 1:
+            raise ValueError('Il faut capacite > 0 et '
+                             '0 < taux_faux_positifs < 1')
+        bits = math.ceil(-capacite * math.log(taux_faux_positifs)
+                         / math.log(2) ** 2)
+        if octets is not None:
+            bits = min(bits, octets * 8)
+        self.bits = max(bits, 8)
+        self.nb_hachages = max(1, round(self.bits / capacite * math.log(2)))
+        self.tableau = bytearray((self.bits + 7) // 8)
+        self.capacite = capacite
+        self.nb_elements = 0
+        self.nb_essais = 0
+        self.nb_bits_a_un = 0
+
+    def _positions(self, element):
+        # Double hachage : les k positions sont h1 + i * h2 modulo le
+        # nombre de bits
+        empreinte = int.from_bytes(
+            hashlib.blake2b(element.encode(), digest_size=16).digest(),
+            'little')
+        h1, h2 = empreinte >> 64, empreinte & 0xFFFFFFFFFFFFFFFF | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.nb_hachages)]
+
+    def __contains__(self, element):
+        tableau = self.tableau
+        return all(tableau[p >> 3] >> (p & 7) & 1
+                   for p in self._positions(element))
+
+    def ajoute(self, element):
+        '''Ajoute element au filtre. Renvoie True s'il n'y était pas, False
+        s'il y était probablement déjà.'''
+        self.nb_essais += 1
+        tableau = self.tableau
+        nouveaux = 0
+        for p in self._positions(element):
+            octet = tableau[p >> 3]
+            bit = 1 << (p & 7)
+            if not octet & bit:
+                tableau[p >> 3] = octet | bit
+                nouveaux += 1
+        if nouveaux:
+            self.nb_bits_a_un += nouveaux
+            self.nb_elements += 1
+            return True
+        return False
+
+    def __len__(self):
+        return self.nb_elements
+
+    @property
+    def nb_rejets(self):
+        return self.nb_essais - self.nb_elements
+
+    @property
+    def taux_rejet(self):
+        'Part des éléments ajoutés qui ont été rejetés'
+        return self.nb_rejets / self.nb_essais if self.nb_essais else 0
+
+    @property
+    def remplissage(self):
+        'Part des bits à un'
+        return self.nb_bits_a_un / self.bits
+
+    @property
+    def taux_faux_positifs_estime(self):
+        'Probabilité actuelle qu\'un élément nouveau soit rejeté'
+        return self.remplissage ** self.nb_hachages
+
+    def statistiques(self):
+        return {'elements': self.nb_elements, 'essais': self.nb_essais,
+                'taux_rejet': self.taux_rejet,
+                'remplissage': self.remplissage,
+                'taux_faux_positifs_estime': self.taux_faux_positifs_estime,
+                'octets': len(self.tableau)}
+
+
+class Partition:
+    '''Filtre qui n'accepte que les éléments de la partie numéro partie
+    (sur nb_parties, selon leur empreinte CRC-32), et parmi eux ceux que
+    filtre accepte s'il est donné'''
+
+    def __init__(self, partie, nb_parties, filtre=None):
+        if not 0 <= partie < nb_parties:
+            raise ValueError('Il faut 0 <= partie < nb_parties')
+        self.partie = partie
+        self.nb_parties = nb_parties
+        self.filtre = filtre
+
+    def __contains__(self, element):
+        return zlib.crc32(element.encode()) % self.nb_parties == self.partie
+
+    def ajoute(self, element):
+        '''Renvoie True si element est de cette partie et nouveau pour
+        filtre'''
+        if element not in self:
+            return False
+        return self.filtre is None or self.filtre.ajoute(element)
+
+
+class HyperLogLog:
+    '''Estimation du nombre d'éléments différents ajoutés, en mémoire
+    constante (2 ** precision registres d'un octet)'''
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError('Il faut 4 <= precision <= 18')
+        self.precision = precision
+        self.registres = bytearray(1 << precision)
+
+    def ajoute(self, element):
+        empreinte = int.from_bytes(
+            hashlib.blake2b(element.encode(), digest_size=8).digest(),
+            'little')
+        # Les premiers bits choisissent le registre, qui garde le rang du
+        # premier bit à un du reste de l'empreinte le plus grand vu
+        registre = empreinte & (len(self.registres) - 1)
+        reste = empreinte >> self.precision
+        rang = 64 - self.precision - reste.bit_length() + 1
+        if rang > self.registres[registre]:
+            self.registres[registre] = rang
+
+    def fusionne(self, autre):
+        '''Ajoute les éléments de autre (de même précision), par exemple
+        compté dans un autre processus'''
+        if autre.precision != self.precision:
+            raise ValueError('Précisions différentes')
+        self.registres = bytearray(map(max, self.registres, autre.registres))
+
+    def estimation(self):
+        m = len(self.registres)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimation = alpha * m * m / sum(2.0 ** -r for r in self.registres)
+        vides = self.registres.count(0)
+        if estimation <= 2.5 * m and vides:
+            # Peu d'éléments : comptage linéaire des registres vides
+            estimation = m * math.log(m / vides)
+        return estimation
+
+    @property
+    def erreur_relative(self):
+        return 1.04 / math.sqrt(len(self.registres))
@@ -20,19 +20,144 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 #
 
-from texte import genere_phrase, finalise_phrase
-import random
-import speake3
+'''Lit des phrases générées avec un synthétiseur vocal local (espeak-ng)
+et les enregistre en fichiers WAV.
+
+La génération et la synthèse se recouvrent : les phrases sont envoyées au
+fur et à mesure à un pool de processus qui lancent le synthétiseur, pendant
+que les suivantes sont générées. Les fichiers sont rangés dans un cache
+adressé par leur contenu (empreinte de la phrase et de la voix) : une phrase
+déjà lue avec la même voix n'est jamais synthétisée une seconde fois.
+
+    python voix_texte.py -n 100 -o audio
+
+écrit les fichiers dans audio/ et affiche chaque chemin avec sa phrase.'''
+
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import time
+
+from texte import genere_phrases
+
+SYNTHETISEUR = 'espeak-ng'
+
+
+def cle_audio(phrase, voix):
+    'Clé du fichier audio de la phrase lue avec la voix'
+    return hashlib.sha256(f'{voix}\0{phrase}'.encode()).hexdigest()
+
+
+class AudioCache:
+    '''Fichiers WAV rangés par contenu dans dossier : chaque fichier porte
+    l'empreinte de sa phrase et de sa voix, dans un sous-dossier nommé
+    d'après ses deux premiers caractères'''
+
+    def __init__(self, dossier):
+        self.dossier = Path(dossier)
+
+    def chemin(self, phrase, voix):
+        cle = cle_audio(phrase, voix)
+        return self.dossier / cle[:2] / f'{cle}.wav'
+
+    def __contains__(self, phrase_voix):
+        return self.chemin(*phrase_voix).exists()
+
+
+def synthetise(phrase, chemin, voix='fr', synthetiseur=SYNTHETISEUR):
+    '''Lit la phrase avec le synthétiseur et l'enregistre dans le fichier
+    WAV chemin. Le fichier n'apparaît qu'une fois complet.'''
+    chemin = Path(chemin)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = chemin.with_name(f'{chemin.name}.{os.getpid()}')
+    try:
+        subprocess.run([synthetiseur, '-v', voix, '-w', str(temporaire),
+                        '--stdin'], input=phrase, text=True, check=True,
+                       stdout=subprocess.DEVNULL)
+        os.replace(temporaire, chemin)
+    finally:
+        if temporaire.exists():
+            temporaire.unlink()
+    return chemin
+
+
+def lit_phrases(phrases, cache, voix='fr', processus=None, en_attente=None,
+                synthetiseur=SYNTHETISEUR):
+    '''Synthétise les phrases dans cache avec un pool de processus. phrases
+    est un itérable lu au fur et à mesure : au plus en_attente phrases (par
+    défaut deux par processus) attendent leur fichier pendant que les
+    suivantes sont générées.
+
+    Renvoie, dans l'ordre des phrases, des triplets (phrase, chemin du WAV,
+    synthétisée), où synthétisée est faux pour les phrases trouvées dans le
+    cache ou déjà demandées plus tôt.'''
+    processus = processus or os.cpu_count()
+    en_attente = en_attente or 2 * processus
+    with ProcessPoolExecutor(processus) as executor:
+        # Synthèses lancées et pas encore rendues, par chemin
+        en_cours = {}
+        file = deque()
+        for phrase in phrases:
+            chemin = cache.chemin(phrase, voix)
+            synthese = None
+            if chemin not in en_cours and not chemin.exists():
+                synthese = en_cours[chemin] = executor.submit(
+                    synthetise, phrase, chemin, voix, synthetiseur)
+            file.append((phrase, chemin, synthese))
+            while file and (len(file) > en_attente or file[0][2] is None
+                            or file[0][2].done()):
+                yield _rend(file.popleft(), en_cours)
+        while file:
+            yield _rend(file.popleft(), en_cours)
+
+
+def _rend(element, en_cours):
+    'Attend la synthèse de element si elle a été lancée'
+    phrase, chemin, synthese = element
+    if synthese is not None:
+        synthese.result()
+        del en_cours[chemin]
+    return phrase, chemin, synthese is not None
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--phrases', type=int, default=100,
+                        help='nombre de phrases')
+    parser.add_argument('-o', '--dossier', default='audio',
+                        help='dossier du cache de fichiers WAV')
+    parser.add_argument('-v', '--voix', default='fr',
+                        help='voix du synthétiseur')
+    parser.add_argument('-j', '--processus', type=int,
+                        default=os.cpu_count(),
+                        help='nombre de processus de synthèse')
+    parser.add_argument('-s', '--graine', type=int,
+                        help='graine de la génération')
+    parser.add_argument('--synthetiseur', default=SYNTHETISEUR,
+                        help='commande compatible avec espeak-ng')
+    args = parser.parse_args(args)
+    if shutil.which(args.synthetiseur) is None:
+        parser.error(f'{args.synthetiseur} est introuvable')
+
+    debut = time.perf_counter()
+    synthetisees = total = 0
+    for phrase, chemin, synthetisee in lit_phrases(
+            genere_phrases(args.phrases, seed=args.graine),
+            AudioCache(args.dossier), args.voix, args.processus,
+            synthetiseur=args.synthetiseur):
+        print(f'{chemin}\t{phrase}')
+        total += 1
+        synthetisees += synthetisee
+    print(f'{total} phrases, {synthetisees} synthétisées, '
+          f'{total - synthetisees} déjà en cache, '
+          f'{time.perf_counter() - debut:.2f} s', file=sys.stderr)
+
 
-phrases = []
 if __name__ == '__main__':
-    for x in range(0, 100):
-        phrase = genere_phrase()['contenu']
-        phrases.append(finalise_phrase(phrase))
-        print(phrases[-1])
-        
-    e = speake3.Speake()
-    e.set('voice', 'fr')
-    for i in range(0, 5):
-        e.say(random.choice(phrases))
-    e.talkback()
\ No newline at end of file
+    main()